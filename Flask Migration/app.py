@@ -8,13 +8,14 @@ import os
 import io
 import csv
 import json
+import time
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import orjson
 import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, make_response
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, session, jsonify, send_file
 from werkzeug.utils import secure_filename
 from werkzeug.security import check_password_hash, generate_password_hash
 
@@ -37,9 +38,27 @@ UPLOAD_FOLDER = 'uploads'
 EXPORT_FOLDER = 'exports'
 ALLOWED_EXTENSIONS = {'csv'}
 
+# Sort query parameters mapped to result column names
+SORT_COLUMN_MAP = {
+    'shrinkage_cost': 'Shrinkage Cost',
+    'total_cost': 'Total Cost',
+    'waste_cost': 'Waste Cost',
+    'used_cost': 'Used Cost',
+    'waste_percentage': 'Waste %',
+    'shrinkage_percentage': 'Shrinkage %',
+    'received_qty': 'Received Qty',
+    'used_qty': 'Used Qty',
+    'wasted_qty': 'Wasted Qty',
+    'ingredient': 'Ingredient',
+    'unit_cost': 'Unit Cost'
+}
+
+SESSION_FOLDER = Path(EXPORT_FOLDER) / 'sessions'
+
 # Ensure directories exist
 Path(UPLOAD_FOLDER).mkdir(exist_ok=True)
 Path(EXPORT_FOLDER).mkdir(exist_ok=True)
+SESSION_FOLDER.mkdir(exist_ok=True)
 
 # Initialize components
 auth_manager = AuthManager()
@@ -47,54 +66,96 @@ data_processor = DataProcessor()
 pdf_generator = PDFReportGenerator()
 excel_generator = ExcelReportGenerator()
 
-# File-based storage for session data to avoid cookie size limits
+# File-based storage for processed frames to avoid cookie size limits.
+# Only the session id lives in the cookie; the typed frame is kept as Parquet.
 import pickle
-import uuid
-
-def save_session_data(username, data):
-    """Save session data to file and return session ID."""
-    session_id = str(uuid.uuid4())
-    file_path = Path(UPLOAD_FOLDER) / f"session_{username}_{session_id}.pkl"
-    with open(file_path, 'wb') as f:
-        pickle.dump(data, f)
-    return session_id
-
-def load_session_data(username, session_id):
-    """Load session data from file."""
-    file_path = Path(UPLOAD_FOLDER) / f"session_{username}_{session_id}.pkl"
-    if file_path.exists():
-        with open(file_path, 'rb') as f:
-            return pickle.load(f)
-    return None
+from functools import lru_cache
+from uuid import uuid4
+
+def _session_frame_path(sid):
+    """Return the Parquet path for a processed-data session id."""
+    return SESSION_FOLDER / f"{sid}.parquet"
+
+def _session_summary_path(sid):
+    """Return the path of the precomputed summary for a session id."""
+    return SESSION_FOLDER / f"{sid}.summary.pkl"
+
+def save_frame(df, sid):
+    """Persist a processed results frame for the given session id."""
+    df.to_parquet(_session_frame_path(sid), engine='pyarrow', compression='zstd', index=False)
+
+@lru_cache(maxsize=32)
+def _read_frame(sid, mtime):
+    """Read a cached frame; keyed on mtime so rewrites invalidate the entry."""
+    return pd.read_parquet(_session_frame_path(sid), engine='pyarrow')
+
+def load_frame(sid):
+    """Load the processed results frame for a session id, or None if missing.
+
+    The returned frame is shared between requests and must not be mutated.
+    """
+    try:
+        mtime = _session_frame_path(sid).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_frame(sid, mtime)
+
+def save_summary(results, sid):
+    """Compute summary stats, insights and filter masks once and persist them."""
+    masks = data_processor.compute_masks(results)
+    summary = {
+        'stats': data_processor.calculate_summary_stats(results, masks),
+        'insights': data_processor.get_insights(results),
+        'masks': masks
+    }
+    with open(_session_summary_path(sid), 'wb') as f:
+        pickle.dump(summary, f)
+    return summary
+
+@lru_cache(maxsize=32)
+def _read_summary(sid, mtime):
+    """Read a cached summary; keyed on mtime so rewrites invalidate the entry."""
+    with open(_session_summary_path(sid), 'rb') as f:
+        return pickle.load(f)
+
+def load_summary(sid):
+    """Load the precomputed summary for a session id, or None if missing."""
+    try:
+        mtime = _session_summary_path(sid).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_summary(sid, mtime)
+
+def get_summary(results, sid):
+    """Return the stored summary for a session, rebuilding it if it is missing."""
+    return load_summary(sid) or save_summary(results, sid)
+
+def store_results(results):
+    """Persist processed results and their summary under a new session id."""
+    sid = uuid4().hex
+    save_frame(results, sid)
+    save_summary(results, sid)
+    return sid
 
 def cleanup_old_session_files():
     """Clean up old session files."""
-    upload_path = Path(UPLOAD_FOLDER)
-    for file_path in upload_path.glob("session_*.pkl"):
+    for file_path in SESSION_FOLDER.glob("*"):
         # Remove files older than 24 hours
         if (datetime.now().timestamp() - file_path.stat().st_mtime) > 86400:
             file_path.unlink(missing_ok=True)
 
+def _file_timestamp():
+    """Return the local time as YYYYmmdd_HHMMSS for file names."""
+    t = time.localtime()
+    return f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def normalize_sort_column(sort_param):
     """Normalize sort parameter to actual column name."""
-    column_mapping = {
-        'shrinkage_cost': 'Shrinkage Cost',
-        'total_cost': 'Total Cost',
-        'waste_cost': 'Waste Cost',
-        'used_cost': 'Used Cost',
-        'waste_percentage': 'Waste %',
-        'shrinkage_percentage': 'Shrinkage %',
-        'received_qty': 'Received Qty',
-        'used_qty': 'Used Qty',
-        'wasted_qty': 'Wasted Qty',
-        'ingredient': 'Ingredient',
-        'unit_cost': 'Unit Cost'
-    }
-    return column_mapping.get(sort_param, sort_param)
+    return SORT_COLUMN_MAP.get(sort_param, sort_param)
 
 @app.route('/')
 def index():
@@ -146,7 +207,7 @@ def upload_files():
             file = request.files[file_type]
             if file and allowed_file(file.filename):
                 filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = _file_timestamp()
                 safe_filename = f"{file_type}_{timestamp}_{filename}"
                 file_path = os.path.join(UPLOAD_FOLDER, safe_filename)
                 file.save(file_path)
@@ -159,13 +220,9 @@ def upload_files():
         try:
             results = data_processor.process_files(files)
             # Store large data server-side, just keep reference in session
-            session_id = f"{session.get('username', 'unknown')}_{datetime.now().timestamp()}"
-            stored_data = {
-                'results': results.to_json(orient='records'),
-                'upload_timestamp': datetime.now().isoformat()
-            }
-            session['data_session_id'] = session_id
+            session['data_sid'] = store_results(results)
             session['upload_timestamp'] = datetime.now().isoformat()
+            cleanup_old_session_files()
             flash('Files processed successfully!', 'success')
             return redirect(url_for('analytics'))
         except Exception as e:
@@ -180,33 +237,38 @@ def analytics():
     if 'username' not in session:
         return redirect(url_for('login'))
     
-    stored_data = None
-    if 'data_session_id' in session:
-        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])
-    if not stored_data:
+    results = load_frame(session['data_sid']) if 'data_sid' in session else None
+    if results is None:
         flash('No data available. Please upload CSV files first.', 'warning')
         return redirect(url_for('upload_files'))
     
-    # Load results from file storage
-    username = session.get('username', 'unknown')
-    stored_data = load_session_data(username, session['data_session_id'])
-    results = pd.read_json(StringIO(stored_data['results']), orient='records')
-    
     # Apply filters if any
     filter_type = request.args.get('filter', 'all')
     sort_by_param = request.args.get('sort', 'shrinkage_cost')
     sort_by = normalize_sort_column(sort_by_param)
     sort_order = request.args.get('order', 'desc')
     
-    filtered_results = data_processor.apply_filters(results, filter_type)
+    # Summary statistics, insights and filter masks are precomputed for the
+    # full data set; only recompute them when a filter narrows the rows
+    summary = get_summary(results, session['data_sid'])
+    masks = summary.get('masks')
+    
+    filtered_results = data_processor.apply_filters(results, filter_type, masks)
     sorted_results = data_processor.sort_results(filtered_results, sort_by, sort_order)
     
-    # Calculate summary statistics
-    summary_stats = data_processor.calculate_summary_stats(sorted_results)
+    # Alerts are listed in the user's sort order, filtered or not; the stored
+    # masks are reordered to the sorted rows instead of being recomputed
+    if masks is not None:
+        positions = results.index.get_indexer(sorted_results.index)
+        masks = {name: mask[positions] for name, mask in masks.items()}
+    alerts = data_processor.get_alerts(sorted_results, masks)
     
-    # Get alerts and insights
-    alerts = data_processor.get_alerts(sorted_results)
-    insights = data_processor.get_insights(sorted_results)
+    if filtered_results is results:
+        summary_stats = summary['stats']
+        insights = summary['insights']
+    else:
+        summary_stats = data_processor.calculate_summary_stats(sorted_results, masks)
+        insights = data_processor.get_insights(sorted_results)
     
     return render_template('analytics.html', 
                          results=sorted_results.to_dict('records'),
@@ -223,10 +285,7 @@ def reports():
     if 'username' not in session:
         return redirect(url_for('login'))
     
-    stored_data = None
-    if 'data_session_id' in session:
-        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])
-    if not stored_data:
+    if 'data_sid' not in session or not _session_frame_path(session['data_sid']).exists():
         flash('No data available. Please upload CSV files first.', 'warning')
         return redirect(url_for('upload_files'))
     
@@ -238,32 +297,24 @@ def export_pdf():
     if 'username' not in session:
         return redirect(url_for('login'))
     
-    stored_data = None
-    if 'data_session_id' in session:
-        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])
-    if not stored_data:
+    results = load_frame(session['data_sid']) if 'data_sid' in session else None
+    if results is None:
         flash('No data available. Please upload CSV files first.', 'warning')
         return redirect(url_for('upload_files'))
     
     try:
-        # Retrieve data from file storage
-        username = session.get('username', 'unknown')
-        stored_data = load_session_data(username, session['data_session_id'])
-        if not stored_data:
-            flash('Session data expired. Please upload files again.', 'warning')
-            return redirect(url_for('upload_files'))
-        results = pd.read_json(StringIO(stored_data['results']), orient='records')
-        summary_stats = data_processor.calculate_summary_stats(results)
+        summary = get_summary(results, session['data_sid'])
+        summary_stats = summary['stats']
         
         # Generate PDF
         pdf_buffer = pdf_generator.generate_report(results, summary_stats, session['username'])
         
-        # Create response
-        response = make_response(pdf_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=ingredient_tracker_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
-        
-        return response
+        # Stream the buffer directly instead of copying it into a response body
+        pdf_buffer.seek(0)
+        return send_file(pdf_buffer,
+                         mimetype='application/pdf',
+                         as_attachment=True,
+                         download_name=f'ingredient_tracker_report_{_file_timestamp()}.pdf')
     except Exception as e:
         flash(f'Error generating PDF: {str(e)}', 'error')
         return redirect(url_for('reports'))
@@ -277,37 +328,29 @@ def export_excel():
         print("No username in session - redirecting to login")
         return redirect(url_for('login'))
     
-    stored_data = None
-    if 'data_session_id' in session:
-        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])
-    if not stored_data:
-        print("No data_session_id in session or data not found - redirecting to upload")
+    results = load_frame(session['data_sid']) if 'data_sid' in session else None
+    if results is None:
+        print("No data_sid in session or data not found - redirecting to upload")
         flash('No data available. Please upload CSV files first.', 'warning')
         return redirect(url_for('upload_files'))
     
     try:
         print("Starting Excel generation...")
         
-        # Retrieve data from file storage
-        username = session.get('username', 'unknown')
-        stored_data = load_session_data(username, session['data_session_id'])
-        if not stored_data:
-            flash('Session data expired. Please upload files again.', 'warning')
-            return redirect(url_for('upload_files'))
-        results = pd.read_json(StringIO(stored_data['results']), orient='records')
-        summary_stats = data_processor.calculate_summary_stats(results)
-        insights = data_processor.get_insights(results)
+        summary = get_summary(results, session['data_sid'])
+        summary_stats = summary['stats']
+        insights = summary['insights']
         
         # Generate Excel
         excel_buffer = excel_generator.generate_report(results, summary_stats, insights, session['username'])
-        print(f"Excel generated successfully: {len(excel_buffer.getvalue())} bytes")
-        
-        # Create response
-        response = make_response(excel_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = f'attachment; filename=ingredient_tracker_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        print(f"Excel generated successfully: {excel_buffer.getbuffer().nbytes} bytes")
         
-        return response
+        # Stream the buffer directly instead of copying it into a response body
+        excel_buffer.seek(0)
+        return send_file(excel_buffer,
+                         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                         as_attachment=True,
+                         download_name=f'ingredient_tracker_report_{_file_timestamp()}.xlsx')
     except Exception as e:
         print(f"Excel generation error: {str(e)}")
         flash(f'Error generating Excel: {str(e)}', 'error')
@@ -338,15 +381,12 @@ def sample_data():
         results = data_processor.process_files(sample_files)
         
         # Store large data in file, just keep reference in session
-        username = session.get('username', 'unknown')
-        session_id = save_session_data(username, {
-            'results': results.to_json(orient='records'),
-            'upload_timestamp': datetime.now().isoformat()
-        })
-        session['data_session_id'] = session_id
+        sid = store_results(results)
+        session['data_sid'] = sid
+        session['upload_timestamp'] = datetime.now().isoformat()
         
         print(f"Sample data processed. Session after: {list(session.keys())}")
-        print(f"Results stored in file with ID: {session_id}")
+        print(f"Results stored in file with ID: {sid}")
         
         # Clean up old files periodically
         cleanup_old_session_files()
@@ -364,17 +404,12 @@ def api_data():
     if 'username' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    stored_data = None
-    if 'data_session_id' in session:
-        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])
-    if not stored_data:
+    results = load_frame(session['data_sid']) if 'data_sid' in session else None
+    if results is None:
         return jsonify({'error': 'No data available'}), 404
     
-    # Retrieve data from server-side storage
-    data_session_id = session['data_session_id']
-    stored_data = stored_data
-    results = pd.read_json(StringIO(stored_data['results']), orient='records')
-    return jsonify(results.to_dict('records'))
+    payload = orjson.dumps(results.to_dict('records'), option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(payload, mimetype='application/json')
 
 @app.route('/settings')
 def settings():
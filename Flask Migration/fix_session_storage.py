@@ -18,18 +18,16 @@ def fix_session_storage():
     results = pd\.read_json\(StringIO\(stored_data\['results'\]\), orient='records'\)'''
     
     analytics_replacement = r'''    # Load results from file storage
-    username = session.get('username', 'unknown')
-    stored_data = load_session_data(username, session['data_session_id'])
-    if not stored_data:
+    results = load_frame(session['data_sid'])
+    if results is None:
         flash('Session data expired. Please upload files again.', 'warning')
-        return redirect(url_for('upload_files'))
-    results = pd.read_json(StringIO(stored_data['results']), orient='records')'''
+        return redirect(url_for('upload_files'))'''
     
     content = re.sub(analytics_pattern, analytics_replacement, content)
     
     # Pattern for all session data checks
     check_pattern = r"if 'data_session_id' not in session or session\['data_session_id'\] not in session_data_store:"
-    check_replacement = r"stored_data = None\n    if 'data_session_id' in session:\n        stored_data = load_session_data(session.get('username', 'unknown'), session['data_session_id'])\n    if not stored_data:"
+    check_replacement = r"if 'data_sid' not in session or load_frame(session['data_sid']) is None:"
     
     content = re.sub(check_pattern, check_replacement, content)
     
@@ -40,12 +38,10 @@ def fix_session_storage():
         results = pd\.read_json\(StringIO\(stored_data\['results'\]\), orient='records'\)'''
     
     retrieval_replacement = r'''        # Retrieve data from file storage
-        username = session.get('username', 'unknown')
-        stored_data = load_session_data(username, session['data_session_id'])
-        if not stored_data:
+        results = load_frame(session['data_sid'])
+        if results is None:
             flash('Session data expired. Please upload files again.', 'warning')
-            return redirect(url_for('upload_files'))
-        results = pd.read_json(StringIO(stored_data['results']), orient='records')'''
+            return redirect(url_for('upload_files'))'''
     
     content = re.sub(retrieval_pattern, retrieval_replacement, content)
     
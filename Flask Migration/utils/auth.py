@@ -3,7 +3,25 @@ Authentication utilities for the Restaurant Ingredient Tracker.
 """
 
 import os
-from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.security import check_password_hash
+
+
+# Demo accounts for testing. Hashes are precomputed so importing this module
+# does not run PBKDF2 (admin123, manager456, staff789).
+DEMO_USERS = {
+    'admin': {
+        'password_hash': 'pbkdf2:sha256:600000$Rm3F2bOnZYKYAw07$e219d2916245d51602af7e13e3273034adad04a3f42e70f60db43d02b3a354a9',
+        'role': 'admin'
+    },
+    'manager': {
+        'password_hash': 'pbkdf2:sha256:600000$wqL0zHEBnuUCGKLj$16dcae04beff93b3c9bfb85e5c66ab11bedce9fbf0d231696b248c63ceee0b72',
+        'role': 'manager'
+    },
+    'staff': {
+        'password_hash': 'pbkdf2:sha256:600000$okUJ2YIUKAOIS2LY$aafa1701ca035998aaf0547c2aa8570820e3054aec6e0862fbc47e7c4e084652',
+        'role': 'staff'
+    }
+}
 
 
 class AuthManager:
@@ -11,21 +29,7 @@ class AuthManager:
     
     def __init__(self):
         """Initialize authentication manager with demo accounts."""
-        # Demo accounts for testing
-        self.demo_users = {
-            'admin': {
-                'password_hash': generate_password_hash('admin123'),
-                'role': 'admin'
-            },
-            'manager': {
-                'password_hash': generate_password_hash('manager456'),
-                'role': 'manager'
-            },
-            'staff': {
-                'password_hash': generate_password_hash('staff789'),
-                'role': 'staff'
-            }
-        }
+        self.demo_users = DEMO_USERS
         
         # Check if running in Replit environment
         self.is_replit = bool(os.environ.get('REPL_ID'))
@@ -2,11 +2,57 @@
 Data processing utilities for the Restaurant Ingredient Tracker.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from typing import Dict, List, Optional, Tuple
 
 
+# Derived columns produced by _compute_metrics, in output order
+METRIC_COLUMNS = [
+    'Expected Use', 'Shrinkage',
+    'Used Cost', 'Waste Cost', 'Shrinkage Cost', 'Total Cost',
+    'Waste %', 'Shrinkage %'
+]
+
+
+def _compute_metrics(recv: np.ndarray, used: np.ndarray, wasted: np.ndarray, unit: np.ndarray) -> np.ndarray:
+    """Compute all derived metrics into one preallocated (N, 8) block.
+
+    Every step writes into its output column in place, so no temporary
+    arrays are created. Costs are rounded to 2 decimals and percentages
+    to 1; percentages are infinite where nothing was received, or 0 if
+    there was no waste or shrinkage either.
+    """
+    out = np.empty((recv.size, len(METRIC_COLUMNS)), order='F')
+    expected, shrinkage, used_cost, waste_cost, shrinkage_cost, total_cost, waste_pct, shrinkage_pct = out.T
+
+    np.add(used, wasted, out=expected)
+    np.subtract(recv, expected, out=shrinkage)
+
+    np.multiply(used, unit, out=used_cost)
+    np.multiply(wasted, unit, out=waste_cost)
+    np.multiply(shrinkage, unit, out=shrinkage_cost)
+    np.add(used_cost, waste_cost, out=total_cost)
+    total_cost += shrinkage_cost
+
+    # Nothing received gives +/-inf where there was waste or shrinkage and
+    # 0 where there was none (0/0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(wasted, recv, out=waste_pct)
+        np.divide(shrinkage, recv, out=shrinkage_pct)
+    pct = out[:, 6:]
+    pct *= 100
+    pct[np.isnan(pct)] = 0
+
+    np.round(out[:, 2:6], 2, out=out[:, 2:6])
+    np.round(out[:, 6:], 1, out=out[:, 6:])
+    return out
+
+
 class DataProcessor:
     """Handles all data processing operations for ingredient tracking."""
     
@@ -18,13 +64,20 @@ class DataProcessor:
             'usage': ['Ingredient', 'Used Qty'],
             'waste': ['Ingredient', 'Wasted Qty']
         }
+        # Column types known up front; quantities are left to inference so
+        # stray text still coerces to 0 downstream
+        self.column_types = {
+            'Ingredient': pa.string(),
+            'Unit Cost': pa.float64()
+        }
     
     def validate_csv_structure(self, file_path: str, file_type: str) -> bool:
         """Validate that CSV has required columns."""
         try:
-            df = pd.read_csv(file_path)
+            # Only the header is needed here; the data is read in process_files
+            columns = pd.read_csv(file_path, nrows=0).columns
             required_cols = self.required_columns[file_type]
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in required_cols if col not in columns]
             
             if missing_cols:
                 raise ValueError(f"Missing columns in {file_type}: {missing_cols}")
@@ -33,6 +86,16 @@ class DataProcessor:
         except Exception as e:
             raise ValueError(f"Error validating {file_type}: {str(e)}")
     
+    def _read_csv(self, file_path: str) -> pd.DataFrame:
+        """Read a CSV with the Arrow reader using the known column types."""
+        convert_options = pacsv.ConvertOptions(column_types=self.column_types)
+        return pacsv.read_csv(file_path, convert_options=convert_options).to_pandas()
+    
+    def _normalize_names(self, names: pd.Series) -> pd.Series:
+        """Strip and title-case ingredient names, once per distinct value."""
+        mapping = {name: name.strip().title() for name in pd.unique(names) if isinstance(name, str)}
+        return names.map(mapping)
+    
     def process_files(self, file_paths: Dict[str, str]) -> pd.DataFrame:
         """Process uploaded CSV files and calculate metrics."""
         
@@ -40,119 +103,140 @@ class DataProcessor:
         for file_type, file_path in file_paths.items():
             self.validate_csv_structure(file_path, file_type)
         
-        # Load data
-        ingredient_info = pd.read_csv(file_paths['ingredient_info'])
-        input_stock = pd.read_csv(file_paths['input_stock'])
-        usage = pd.read_csv(file_paths['usage'])
-        waste = pd.read_csv(file_paths['waste'])
+        # Load data; the reads are independent and the Arrow reader releases
+        # the GIL, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(file_paths)) as executor:
+            frames = dict(zip(file_paths, executor.map(self._read_csv, file_paths.values())))
+        ingredient_info = frames['ingredient_info']
+        input_stock = frames['input_stock']
+        usage = frames['usage']
+        waste = frames['waste']
         
         # Clean and standardize data
         for df in [ingredient_info, input_stock, usage, waste]:
-            df['Ingredient'] = df['Ingredient'].str.strip().str.title()
+            df['Ingredient'] = self._normalize_names(df['Ingredient'])
         
-        # Merge all data on ingredient
-        merged = ingredient_info.copy()
-        merged = merged.merge(input_stock, on='Ingredient', how='left')
-        merged = merged.merge(usage, on='Ingredient', how='left')
-        merged = merged.merge(waste, on='Ingredient', how='left')
+        # Join all data on ingredient in a single multi-way join; only the
+        # quantity column is taken from each file, so extra columns the files
+        # share (Date, Notes, ...) cannot collide
+        merged = ingredient_info.set_index('Ingredient').join(
+            [frame.set_index('Ingredient')[[column]] for frame, column in (
+                (input_stock, 'Received Qty'), (usage, 'Used Qty'), (waste, 'Wasted Qty')
+            )],
+            how='left'
+        ).reset_index()
         
-        # Fill missing values with 0
+        # Fill missing values with 0 in one block; only columns the reader
+        # could not type as numbers need coercing first
         numeric_columns = ['Received Qty', 'Used Qty', 'Wasted Qty']
-        for col in numeric_columns:
-            merged[col] = pd.to_numeric(merged[col], errors='coerce').fillna(0)
-        
-        # Calculate metrics
-        merged['Expected Use'] = merged['Used Qty'] + merged['Wasted Qty']
-        merged['Shrinkage'] = merged['Received Qty'] - merged['Expected Use']
-        
-        # Calculate costs
-        merged['Used Cost'] = merged['Used Qty'] * merged['Unit Cost']
-        merged['Waste Cost'] = merged['Wasted Qty'] * merged['Unit Cost']
-        merged['Shrinkage Cost'] = merged['Shrinkage'] * merged['Unit Cost']
-        merged['Total Cost'] = merged['Used Cost'] + merged['Waste Cost'] + merged['Shrinkage Cost']
-        
-        # Calculate percentages
-        merged['Waste %'] = (merged['Wasted Qty'] / merged['Received Qty'] * 100).fillna(0)
-        merged['Shrinkage %'] = (merged['Shrinkage'] / merged['Received Qty'] * 100).fillna(0)
-        
-        # Round numerical columns
-        numeric_cols = ['Unit Cost', 'Used Cost', 'Waste Cost', 'Shrinkage Cost', 'Total Cost']
-        for col in numeric_cols:
-            merged[col] = merged[col].round(2)
-        
-        percentage_cols = ['Waste %', 'Shrinkage %']
-        for col in percentage_cols:
-            merged[col] = merged[col].round(1)
+        quantities = merged[numeric_columns]
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in quantities.dtypes):
+            quantities = quantities.apply(pd.to_numeric, errors='coerce')
+        merged[numeric_columns] = quantities.to_numpy(dtype=np.float64, na_value=0.0)
         
+        # Calculate quantity, cost and percentage metrics in one kernel
+        metrics = _compute_metrics(
+            merged['Received Qty'].to_numpy(dtype=np.float64),
+            merged['Used Qty'].to_numpy(dtype=np.float64),
+            merged['Wasted Qty'].to_numpy(dtype=np.float64),
+            merged['Unit Cost'].to_numpy(dtype=np.float64)
+        )
+        merged[METRIC_COLUMNS] = metrics
+        merged['Unit Cost'] = merged['Unit Cost'].round(2)
+
+        # Ingredient names are repeated across every downstream view; store
+        # them dictionary-encoded (Parquet keeps the encoding on save)
+        merged['Ingredient'] = merged['Ingredient'].astype('category')
+
         return merged
     
-    def apply_filters(self, data: pd.DataFrame, filter_type: str) -> pd.DataFrame:
-        """Apply filters to the data."""
-        if filter_type == 'high_shrinkage':
-            return data[data['Shrinkage Cost'] > 10]
-        elif filter_type == 'high_waste':
-            return data[data['Waste %'] > 5]
-        elif filter_type == 'missing_stock':
-            return data[data['Received Qty'] == 0]
-        elif filter_type == 'negative_shrinkage':
-            return data[data['Shrinkage'] < 0]
-        else:
+    def compute_masks(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute the boolean row masks used by filters, stats and alerts."""
+        shrinkage_cost = data['Shrinkage Cost'].to_numpy()
+        waste_pct = data['Waste %'].to_numpy()
+        return {
+            'high_shrinkage': shrinkage_cost > 10,
+            'high_waste': waste_pct > 5,
+            'missing_stock': data['Received Qty'].to_numpy() == 0,
+            'negative_shrinkage': data['Shrinkage'].to_numpy() < 0,
+            'critical_shrinkage': shrinkage_cost > 50,
+            'critical_waste': waste_pct > 15
+        }
+    
+    def apply_filters(self, data: pd.DataFrame, filter_type: str, masks: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
+        """Apply filters to the data.
+
+        ``masks`` may be passed from compute_masks() on the same frame to
+        skip recomputing the comparison.
+        """
+        if filter_type not in ('high_shrinkage', 'high_waste', 'missing_stock', 'negative_shrinkage'):
             return data
+        if masks is None:
+            masks = self.compute_masks(data)
+        return data[masks[filter_type]]
     
     def sort_results(self, data: pd.DataFrame, sort_by: str, order: str = 'desc') -> pd.DataFrame:
         """Sort results by specified column."""
         ascending = order == 'asc'
         return data.sort_values(by=sort_by, ascending=ascending)
     
-    def calculate_summary_stats(self, data: pd.DataFrame) -> Dict:
+    def calculate_summary_stats(self, data: pd.DataFrame, masks: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """Calculate summary statistics."""
+        if masks is None:
+            masks = self.compute_masks(data)
+        totals = data.agg({
+            'Total Cost': 'sum',
+            'Waste Cost': 'sum',
+            'Shrinkage Cost': 'sum',
+            'Waste %': 'mean',
+            'Shrinkage %': 'mean'
+        })
         return {
             'total_ingredients': len(data),
-            'total_cost': data['Total Cost'].sum(),
-            'total_waste_cost': data['Waste Cost'].sum(),
-            'total_shrinkage_cost': data['Shrinkage Cost'].sum(),
-            'avg_waste_percentage': data['Waste %'].mean(),
-            'avg_shrinkage_percentage': data['Shrinkage %'].mean(),
-            'high_shrinkage_items': len(data[data['Shrinkage Cost'] > 10]),
-            'missing_stock_items': len(data[data['Received Qty'] == 0])
+            'total_cost': totals['Total Cost'],
+            'total_waste_cost': totals['Waste Cost'],
+            'total_shrinkage_cost': totals['Shrinkage Cost'],
+            'avg_waste_percentage': totals['Waste %'],
+            'avg_shrinkage_percentage': totals['Shrinkage %'],
+            'high_shrinkage_items': int(masks['high_shrinkage'].sum()),
+            'missing_stock_items': int(masks['missing_stock'].sum())
         }
     
-    def get_alerts(self, data: pd.DataFrame) -> List[Dict]:
+    def get_alerts(self, data: pd.DataFrame, masks: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
         """Generate alerts for problematic items."""
         alerts = []
+        if masks is None:
+            masks = self.compute_masks(data)
         
         # High shrinkage alerts
-        high_shrinkage = data[data['Shrinkage Cost'] > 50]
-        for _, item in high_shrinkage.iterrows():
-            alerts.append({
-                'type': 'high_shrinkage',
-                'severity': 'critical',
-                'message': f"Critical shrinkage: {item['Ingredient']} has ${item['Shrinkage Cost']:.2f} in missing inventory",
-                'ingredient': item['Ingredient'],
-                'value': item['Shrinkage Cost']
-            })
+        high_shrinkage = data[masks['critical_shrinkage']]
+        alerts.extend({
+            'type': 'high_shrinkage',
+            'severity': 'critical',
+            'message': f"Critical shrinkage: {ingredient} has ${value:.2f} in missing inventory",
+            'ingredient': ingredient,
+            'value': value
+        } for ingredient, value in zip(high_shrinkage['Ingredient'].to_numpy(), high_shrinkage['Shrinkage Cost'].to_numpy()))
         
         # High waste alerts
-        high_waste = data[data['Waste %'] > 15]
-        for _, item in high_waste.iterrows():
-            alerts.append({
-                'type': 'high_waste',
-                'severity': 'warning',
-                'message': f"High waste: {item['Ingredient']} has {item['Waste %']:.1f}% waste rate",
-                'ingredient': item['Ingredient'],
-                'value': item['Waste %']
-            })
+        high_waste = data[masks['critical_waste']]
+        alerts.extend({
+            'type': 'high_waste',
+            'severity': 'warning',
+            'message': f"High waste: {ingredient} has {value:.1f}% waste rate",
+            'ingredient': ingredient,
+            'value': value
+        } for ingredient, value in zip(high_waste['Ingredient'].to_numpy(), high_waste['Waste %'].to_numpy()))
         
         # Missing stock alerts
-        missing_stock = data[data['Received Qty'] == 0]
-        for _, item in missing_stock.iterrows():
-            alerts.append({
-                'type': 'missing_stock',
-                'severity': 'warning',
-                'message': f"No stock received for {item['Ingredient']} but usage/waste recorded",
-                'ingredient': item['Ingredient'],
-                'value': 0
-            })
+        missing_stock = data[masks['missing_stock']]
+        alerts.extend({
+            'type': 'missing_stock',
+            'severity': 'warning',
+            'message': f"No stock received for {ingredient} but usage/waste recorded",
+            'ingredient': ingredient,
+            'value': 0
+        } for ingredient in missing_stock['Ingredient'].to_numpy())
         
         return alerts
     
@@ -160,13 +244,25 @@ class DataProcessor:
         """Generate insights from the data."""
         insights = []
         
-        # Top cost contributors
-        top_cost_items = data.nlargest(3, 'Total Cost')
-        total_cost = data['Total Cost'].sum()
+        # Top cost contributors: partition for the 3rd largest cost in O(N), then
+        # order the items reaching it by cost and position, as nlargest would
+        # (ties keep their original order; missing costs rank last)
+        costs = data['Total Cost'].to_numpy(dtype=np.float64)
+        total_cost = np.nansum(costs)
+        missing = np.isnan(costs)
+        top_idx = np.flatnonzero(~missing)
+        top_n = min(3, top_idx.size)
+        if top_n:
+            kth = np.partition(costs[top_idx], top_idx.size - top_n)[top_idx.size - top_n]
+            top_idx = top_idx[costs[top_idx] >= kth]
+        top_idx = np.concatenate([
+            top_idx[np.lexsort((top_idx, -costs[top_idx]))][:top_n],
+            np.flatnonzero(missing)[:3 - top_n]
+        ])
         
-        for _, item in top_cost_items.iterrows():
-            percentage = (item['Total Cost'] / total_cost) * 100
-            insights.append(f"{item['Ingredient']} accounts for {percentage:.1f}% of total costs (${item['Total Cost']:.2f})")
+        for ingredient, cost in zip(data['Ingredient'].to_numpy()[top_idx], costs[top_idx]):
+            percentage = (cost / total_cost) * 100
+            insights.append(f"{ingredient} accounts for {percentage:.1f}% of total costs (${cost:.2f})")
         
         # Waste insights
         avg_waste = data['Waste %'].mean()
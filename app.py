@@ -20,15 +20,28 @@ Version: 1.0
 # Standard library imports for core functionality
 import streamlit as st  # Main web framework for the application
 import pandas as pd     # Data manipulation and analysis
+import numpy as np      # Vectorized array operations
 import io              # Input/output operations for file handling
-from fpdf import FPDF  # PDF generation library
-from typing import Optional, Tuple  # Type hints for better code documentation
+import hmac            # Constant-time credential comparison
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple  # Type hints for better code documentation
 import logging         # Logging functionality (currently unused but available)
 from datetime import datetime  # Date and time operations for timestamps
 import os             # Operating system interface for environment variables
 import requests       # HTTP library (currently unused but available for future API calls)
 from urllib.parse import urlencode  # URL encoding utilities
 import json           # JSON parsing (currently unused but available)
+import re             # Parsing generated worksheet XML
+import zipfile        # Rewriting the Excel workbook package
+from xml.sax.saxutils import escape  # Escaping text written into worksheet XML
+from collections import namedtuple  # Lightweight immutable records
+from functools import lru_cache     # Memoization of expensive lookups
+from itertools import islice        # Taking one page of report rows at a time
+from concurrent.futures import ThreadPoolExecutor  # Parallel cost computation on large catalogs
+
+# The PDF and Excel engines are imported inside the export functions, so
+# sessions that never export do not pay for loading them at startup
+if TYPE_CHECKING:
+    from fpdf import FPDF  # PDF generation library
 
 # Application-wide constants for data formatting and validation
 # These columns will be formatted as currency in displays and exports
@@ -65,6 +78,48 @@ st.set_page_config(
 # AUTHENTICATION SYSTEM - Replit Integration
 # =============================================================================
 
+# Snapshot of the Replit environment variables used for authentication
+ReplitEnv = namedtuple('ReplitEnv', ['repl_id', 'repl_owner', 'replit_user', 'replit_domains'])
+
+@lru_cache(maxsize=1)
+def _read_replit_env() -> ReplitEnv:
+    """
+    Read the Replit authentication environment variables once per process.
+    
+    Returns:
+        ReplitEnv: Values of REPL_ID, REPL_OWNER, REPLIT_USER and REPLIT_DOMAINS
+        
+    Note:
+        These variables are fixed for the lifetime of a Replit instance, so the
+        result is cached. Tests that change them should call
+        ``_read_replit_env.cache_clear()``.
+    """
+    return ReplitEnv(
+        repl_id=os.getenv('REPL_ID'),               # Unique Replit instance ID
+        repl_owner=os.getenv('REPL_OWNER'),         # Workspace owner username
+        replit_user=os.getenv('REPLIT_USER'),       # Current authenticated user
+        replit_domains=os.getenv('REPLIT_DOMAINS')  # Available domains
+    )
+
+# Whether the app runs on Replit; REPL_ID is set for every Replit instance
+# and does not change while the process is alive
+IS_REPLIT_ENV: bool = _read_replit_env().repl_id is not None
+
+# Authentication method recorded on Replit-authenticated users
+_AUTH_METHOD = 'replit_builtin'
+
+# Session state keys owned by authentication and the per-user workspace.
+# These are removed on logout; new per-user keys must be added here.
+AUTH_KEYS = frozenset({
+    'replit_auth',          # Replit authentication status
+    'replit_user',          # Replit user data
+    'current_page',         # Active navigation page
+    'demo_authenticated',   # Demo mode authentication status
+    'demo_username',        # Demo mode username
+    'processed_data',       # Processed report DataFrame
+    'show_sample_data',     # Sample data indicator
+})
+
 class ReplitAuth:
     """
     Enterprise-grade authentication handler for Replit environment.
@@ -80,6 +135,9 @@ class ReplitAuth:
     - Fallback support for non-Replit environments
     """
     
+    # Fixed attribute set; no per-instance __dict__
+    __slots__ = ('repl_id', 'repl_owner', 'replit_user', 'replit_domains', '_cached_user_result')
+    
     def __init__(self):
         """
         Initialize the authentication handler with Replit environment variables.
@@ -91,10 +149,12 @@ class ReplitAuth:
         - REPLIT_DOMAINS: Available domains for the Replit instance
         """
         # Fetch authentication-related environment variables from Replit
-        self.repl_id = os.getenv('REPL_ID')           # Unique Replit instance ID
-        self.repl_owner = os.getenv('REPL_OWNER')     # Workspace owner username
-        self.replit_user = os.getenv('REPLIT_USER')   # Current authenticated user
-        self.replit_domains = os.getenv('REPLIT_DOMAINS')  # Available domains
+        # (read once per process, see _read_replit_env)
+        self.repl_id, self.repl_owner, self.replit_user, self.replit_domains = _read_replit_env()
+        
+        # Successful result of get_authenticated_user(); the inputs are fixed
+        # environment values, so it only needs to be built once
+        self._cached_user_result = None
         
     def is_replit_environment(self) -> bool:
         """
@@ -106,8 +166,9 @@ class ReplitAuth:
         Note:
             This is determined by the presence of the REPL_ID environment variable,
             which is automatically set by Replit for all running instances.
+            The result is computed once at import (IS_REPLIT_ENV).
         """
-        return self.repl_id is not None
+        return IS_REPLIT_ENV
     
     def get_authenticated_user(self) -> dict:
         """
@@ -126,11 +187,19 @@ class ReplitAuth:
             - authenticated: Authentication status
             - auth_method: Authentication method used
             - session_data: Additional session information
+            
+        Note:
+            A successful result is cached on the instance and returned as-is
+            on later calls; treat it as read-only.
         """
         # Return unauthenticated if not in Replit environment
         if not self.is_replit_environment():
             return {'authenticated': False, 'user': None}
         
+        # Reuse the result built on an earlier call
+        if self._cached_user_result is not None:
+            return self._cached_user_result
+        
         # Determine username from available sources (prefer REPLIT_USER over REPL_OWNER)
         username = self.replit_user or self.repl_owner
         
@@ -143,14 +212,15 @@ class ReplitAuth:
                 'display_name': username,                 # Human-readable name
                 'repl_id': self.repl_id,                 # Replit instance ID
                 'authenticated': True,                    # Authentication status
-                'auth_method': 'replit_builtin',         # Authentication method
+                'auth_method': _AUTH_METHOD,             # Authentication method
                 'session_data': {                        # Additional session context
                     'repl_owner': self.repl_owner,
                     'replit_user': self.replit_user,
                     'domains': self.replit_domains
                 }
             }
-            return {'authenticated': True, 'user': user_data}
+            self._cached_user_result = {'authenticated': True, 'user': user_data}
+            return self._cached_user_result
         
         # Return unauthenticated if required data is missing
         return {'authenticated': False, 'user': None}
@@ -173,9 +243,12 @@ class ReplitAuth:
         # Validate user data and authentication status
         if user_data and user_data.get('authenticated'):
             # Store authentication status and user data in session state
-            st.session_state.replit_auth = True
-            st.session_state.replit_user = user_data['user']
-            st.session_state.current_page = "dashboard"  # Default landing page
+            # with a single update
+            st.session_state.update({
+                'replit_auth': True,
+                'replit_user': user_data['user'],
+                'current_page': "dashboard",  # Default landing page
+            })
             return True
         return False
     
@@ -188,18 +261,14 @@ class ReplitAuth:
         an unauthenticated state.
         
         Side Effects:
-            - Removes all auth-related session state keys
+            - Removes the session state keys registered in AUTH_KEYS
             - Resets authentication status to False
             - Redirects to login page
         """
-        # Identify all authentication-related session state keys
-        auth_keys = [key for key in st.session_state.keys() 
-                    if key.startswith(('replit_', 'demo_', 'processed_', 'show_sample_', 'current_page'))]
-        
-        # Remove all identified authentication keys
-        for key in auth_keys:
-            if key in st.session_state:
-                del st.session_state[key]
+        # Remove the registered authentication keys (pop with a default does
+        # one lookup per key whether or not it is present)
+        for key in AUTH_KEYS:
+            st.session_state.pop(key, None)
         
         # Reset authentication state and redirect to login
         st.session_state.replit_auth = False
@@ -230,6 +299,22 @@ class ReplitAuth:
             authentication data, use get_authenticated_user() instead.
         """
         return st.session_state.get('replit_user', {})
+    
+    def _snapshot(self) -> Tuple[bool, Optional[dict]]:
+        """
+        Read authentication status and user data with one session lookup each.
+        
+        Returns:
+            tuple: (is_authenticated, user) where user is the session user data
+            when authenticated, None otherwise
+            
+        Note:
+            Callers that need both values should use this instead of calling
+            is_authenticated() and get_current_user() back to back.
+        """
+        sd = st.session_state
+        auth = sd.get('replit_auth')
+        return bool(auth), (sd.get('replit_user', {}) if auth else None)
 
 # =============================================================================
 # AUTHENTICATION INITIALIZATION & HELPER FUNCTIONS
@@ -254,14 +339,15 @@ def get_replit_user_info():
     auth_result = replit_auth.get_authenticated_user()
     if auth_result['authenticated']:
         user = auth_result['user']
+        session_data = user['session_data']
         # Convert to legacy format for backward compatibility
         return {
             'id': user['id'],
             'name': user['username'],
             'authenticated': True,
             'repl_id': user['repl_id'],
-            'repl_owner': user['session_data']['repl_owner'],
-            'replit_user': user['session_data']['repl_user']
+            'repl_owner': session_data['repl_owner'],
+            'replit_user': session_data['replit_user']
         }
     return {'authenticated': False}
 
@@ -276,7 +362,7 @@ def is_replit_environment():
         This is a convenience wrapper around the ReplitAuth class method.
         Use replit_auth.is_replit_environment() directly in new code.
     """
-    return replit_auth.is_replit_environment()
+    return IS_REPLIT_ENV
 
 # =============================================================================
 # DEMO MODE AUTHENTICATION - For Testing and Development
@@ -284,11 +370,13 @@ def is_replit_environment():
 
 # Demo user accounts for testing the application outside Replit environment
 # These credentials are used when the app is not running in Replit
-DEMO_USERS = {
-    "admin": "admin123",      # Administrative access account
-    "manager": "manager456",  # Management level access
-    "staff": "staff789"       # Staff level access
-}
+# (a tuple of (username, password) pairs; at three entries a linear scan is
+# cheaper than hashing the username)
+DEMO_USERS = (
+    ("admin", "admin123"),      # Administrative access account
+    ("manager", "manager456"),  # Management level access
+    ("staff", "staff789"),      # Staff level access
+)
 
 def verify_demo_password(username: str, password: str) -> bool:
     """
@@ -305,11 +393,31 @@ def verify_demo_password(username: str, password: str) -> bool:
         These are demo credentials only. In production, this should be
         replaced with proper authentication (database, OAuth, etc.).
     """
-    return username in DEMO_USERS and DEMO_USERS[username] == password
-
-def show_replit_login_page():
-    """Display Replit Auth login page."""
-    st.markdown("""
+    # Find the user by a linear scan, then compare passwords in constant
+    # time (encoded so that non-ASCII input compares as False instead of raising)
+    return any(
+        username == demo_user and hmac.compare_digest(demo_password.encode(), password.encode())
+        for demo_user, demo_password in DEMO_USERS
+    )
+
+@lru_cache(maxsize=1)
+def _replit_debug_info() -> dict:
+    """
+    Environment detection summary shown on the login troubleshooting panel.
+    
+    Built from the same fixed environment values as the auth handler, so it
+    is computed once per process.
+    """
+    return {
+        'repl_id_present': replit_auth.repl_id is not None,
+        'repl_owner_present': replit_auth.repl_owner is not None,
+        'replit_user_present': replit_auth.replit_user is not None,
+        'environment_detected': replit_auth.is_replit_environment()
+    }
+
+# Static page headers for the login pages, built once at import rather than
+# on every rerun
+_REPLIT_HEADER_HTML = """
     <div style="text-align: center; padding: 3rem 0;">
         <h1>🍽️ Restaurant Ingredient Tracker</h1>
         <h2>Enterprise Authentication via Replit</h2>
@@ -317,34 +425,69 @@ def show_replit_login_page():
             Secure, scalable authentication powered by enterprise-grade infrastructure
         </p>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Features showcase
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        ### 🔐 Enterprise Security
-        - Firebase & Google Cloud Identity Platform
-        - reCAPTCHA fraud prevention
-        - Global scalability with Stytch
-        """)
+    """
+
+_DEMO_HEADER_HTML = """
+    <div style="text-align: center; padding: 2rem 0;">
+        <h1>🍽️ Restaurant Ingredient Tracker</h1>
+        <h3>Analyze ingredient usage, waste, and costs</h3>
+        <p style="font-size: 1.2rem; color: #666;">
+            Track your restaurant's inventory efficiency and reduce waste costs
+        </p>
+    </div>
+    """
+
+def _feature_card(title: str, *points: str) -> str:
+    """Format a feature card as a markdown heading followed by a bullet list."""
+    return "\n".join([f"### {title}", *(f"- {point}" for point in points)])
+
+# Feature cards shown side by side on the login pages
+REPLIT_CARDS = (
+    _feature_card("🔐 Enterprise Security",
+                  "Firebase & Google Cloud Identity Platform",
+                  "reCAPTCHA fraud prevention",
+                  "Global scalability with Stytch"),
+    _feature_card("📊 Advanced Analytics",
+                  "Ingredient usage tracking",
+                  "Cost analysis & optimization",
+                  "Waste reduction insights"),
+    _feature_card("📈 Smart Reporting",
+                  "PDF & Excel exports",
+                  "Real-time dashboards",
+                  "Custom filtering options"),
+)
+
+DEMO_CARDS = (
+    _feature_card("📊 Data Analysis",
+                  "Upload CSV files for analysis",
+                  "Calculate usage, waste & shrinkage",
+                  "Identify cost-saving opportunities"),
+    _feature_card("📈 Reporting",
+                  "Export to PDF & Excel formats",
+                  "View detailed cost breakdowns",
+                  "Track trends over time"),
+    _feature_card("⚡ Easy to Use",
+                  "Simple file upload interface",
+                  "Sample data for testing",
+                  "Instant report generation"),
+)
+
+def render_feature_cards(cards: Tuple[str, ...]):
+    """
+    Render feature cards in one row of equal-width columns.
     
-    with col2:
-        st.markdown("""
-        ### 📊 Advanced Analytics
-        - Ingredient usage tracking
-        - Cost analysis & optimization
-        - Waste reduction insights
-        """)
+    Args:
+        cards (tuple): Prebuilt markdown for each card (see _feature_card)
+    """
+    for column, card in zip(st.columns(len(cards)), cards):
+        column.markdown(card)
+
+def show_replit_login_page():
+    """Display Replit Auth login page."""
+    st.markdown(_REPLIT_HEADER_HTML, unsafe_allow_html=True)
     
-    with col3:
-        st.markdown("""
-        ### 📈 Smart Reporting
-        - PDF & Excel exports
-        - Real-time dashboards
-        - Custom filtering options
-        """)
+    # Features showcase
+    render_feature_cards(REPLIT_CARDS)
     
     st.markdown("---")
     
@@ -358,16 +501,6 @@ def show_replit_login_page():
             st.success(f"Welcome back, **{user['display_name']}**! Redirecting to your dashboard...")
             st.info("You are authenticated through Replit's enterprise-grade authentication system.")
             
-            # Show user info
-            with st.expander("Authentication Details"):
-                st.json({
-                    'user_id': user['id'],
-                    'username': user['username'],
-                    'auth_method': user['auth_method'],
-                    'repl_id': user['repl_id'][:8] + "...",  # Truncate for privacy
-                    'status': 'Authenticated ✓'
-                })
-            
             st.rerun()
     else:
         # Authentication failed
@@ -392,52 +525,16 @@ def show_replit_login_page():
             
             # Debug info for troubleshooting
             if st.checkbox("Show Debug Information"):
-                st.json({
-                    'repl_id_present': replit_auth.repl_id is not None,
-                    'repl_owner_present': replit_auth.repl_owner is not None,
-                    'replit_user_present': replit_auth.replit_user is not None,
-                    'environment_detected': replit_auth.is_replit_environment()
-                })
+                st.json(_replit_debug_info())
 
 def show_demo_login():
     """Display demo login form for non-Replit environments."""
     # Welcome landing page
-    st.markdown("""
-    <div style="text-align: center; padding: 2rem 0;">
-        <h1>🍽️ Restaurant Ingredient Tracker</h1>
-        <h3>Analyze ingredient usage, waste, and costs</h3>
-        <p style="font-size: 1.2rem; color: #666;">
-            Track your restaurant's inventory efficiency and reduce waste costs
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_DEMO_HEADER_HTML, unsafe_allow_html=True)
     
     # Features overview
     st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown("""
-        ### 📊 Data Analysis
-        - Upload CSV files for analysis
-        - Calculate usage, waste & shrinkage
-        - Identify cost-saving opportunities
-        """)
-    
-    with col2:
-        st.markdown("""
-        ### 📈 Reporting
-        - Export to PDF & Excel formats  
-        - View detailed cost breakdowns
-        - Track trends over time
-        """)
-    
-    with col3:
-        st.markdown("""
-        ### ⚡ Easy to Use
-        - Simple file upload interface
-        - Sample data for testing
-        - Instant report generation
-        """)
+    render_feature_cards(DEMO_CARDS)
     
     st.markdown("---")
     st.info("Running in demo mode. Use the credentials below to test the application.")
@@ -481,13 +578,21 @@ def show_demo_login():
 # USER INTERFACE FUNCTIONS - Navigation and Layout
 # =============================================================================
 
-def show_navigation_sidebar():
+# Navigation pages in sidebar order, mapped to their display labels
+NAV_LABELS = {
+    "dashboard": "🏠 Dashboard",
+    "analytics": "📊 Analytics",
+    "reports": "📤 Reports",
+    "settings": "⚙️ Settings",
+}
+
+def show_navigation_sidebar(auth_snapshot: Optional[Tuple[bool, Optional[dict]]] = None):
     """
     Display the main navigation sidebar with user info and page navigation.
     
     This function creates a comprehensive sidebar that includes:
     - User authentication status and information
-    - Navigation buttons for all main pages
+    - Navigation radio for all main pages
     - Logout functionality with proper session cleanup
     
     Features:
@@ -496,24 +601,28 @@ def show_navigation_sidebar():
     - Clean navigation with emoji icons
     - Proper session state management
     
+    Args:
+        auth_snapshot (tuple, optional): (is_authenticated, user) from
+            replit_auth._snapshot(); read from the session if not given
+    
     Side Effects:
-    - Updates st.session_state.current_page when navigation buttons are clicked
-    - Triggers page reloads using st.rerun() for navigation
+    - Updates st.session_state.current_page through the navigation radio
     - Clears session data during logout
     """
+    is_auth, user = auth_snapshot if auth_snapshot is not None else replit_auth._snapshot()
+    
     with st.sidebar:
         # Application branding and title
         st.markdown("### 🍽️ Restaurant Tracker")
         
         # User information and authentication status section
-        if replit_auth.is_authenticated():
+        if is_auth:
             # Display Replit authenticated user information
-            user = replit_auth.get_current_user()
             username = user.get('display_name', 'User')
-            auth_method = user.get('auth_method', 'replit_builtin')
+            auth_method = user.get('auth_method', _AUTH_METHOD)
             
             st.markdown(f"**Logged in as:** {username}")
-            if auth_method == 'replit_builtin':
+            if auth_method == _AUTH_METHOD:
                 st.markdown("*via Replit Auth* 🔐")
             else:
                 st.markdown(f"*via {auth_method}* 🔐")
@@ -527,55 +636,67 @@ def show_navigation_sidebar():
         # Main navigation section
         st.markdown("### 📋 Navigation")
         
-        # Initialize navigation state if not already set
-        if "current_page" not in st.session_state:
+        # Initialize navigation state if not already set (or left on a page
+        # the radio does not offer, e.g. "login"); this must happen before the
+        # radio is created, since its key cannot be written afterwards
+        if st.session_state.get("current_page") not in NAV_LABELS:
             st.session_state.current_page = "dashboard"
         
-        # Navigation buttons with icons and consistent styling
-        # Each button updates the current page and triggers a rerun
-        if st.button("🏠 Dashboard", type="secondary", use_container_width=True):
-            st.session_state.current_page = "dashboard"
-            st.rerun()
-            
-        if st.button("📊 Analytics", type="secondary", use_container_width=True):
-            st.session_state.current_page = "analytics"
-            st.rerun()
-            
-        if st.button("📤 Reports", type="secondary", use_container_width=True):
-            st.session_state.current_page = "reports"
-            st.rerun()
-            
-        if st.button("⚙️ Settings", type="secondary", use_container_width=True):
-            st.session_state.current_page = "settings"
-            st.rerun()
+        # The radio writes the selection straight to current_page; the widget
+        # change already triggers a rerun, so no st.rerun() is needed
+        st.radio(
+            "Navigation",
+            options=list(NAV_LABELS),
+            format_func=NAV_LABELS.get,
+            key="current_page",
+            label_visibility="collapsed",
+        )
         
         st.markdown("---")  # Visual separator
         
         # Account management section
         st.markdown("### 🔐 Account")
-        if st.button("🚪 Logout", type="primary", use_container_width=True):
-            # Handle logout based on authentication method
-            if replit_auth.is_authenticated():
-                # Use Replit auth logout (comprehensive session cleanup)
-                replit_auth.clear_session()
-            else:
-                # Manual cleanup for demo mode
-                st.session_state.demo_authenticated = False
-                st.session_state.demo_username = None
-                st.session_state.processed_data = None
-                st.session_state.show_sample_data = False
-                st.session_state.current_page = "login"
-            
-            st.success("Logged out successfully!")
-            st.rerun()  # Refresh to show login page
+        st.button("🚪 Logout", type="primary", use_container_width=True,
+                  on_click=_logout, args=(is_auth,))
+
+def _go_to_page(page: str):
+    """
+    Button callback that switches the current page.
+    
+    Callbacks run before the next script run, so current_page can be set
+    here even though it is also the navigation radio's key.
+    """
+    st.session_state.current_page = page
+
+def _logout(is_auth: bool):
+    """
+    Logout button callback; clears the session for the active auth method.
+    
+    Args:
+        is_auth (bool): Whether the user is logged in through Replit Auth
+    """
+    # Handle logout based on authentication method
+    if is_auth:
+        # Use Replit auth logout (comprehensive session cleanup)
+        replit_auth.clear_session()
+    else:
+        # Manual cleanup for demo mode
+        st.session_state.demo_authenticated = False
+        st.session_state.demo_username = None
+        st.session_state.processed_data = None
+        st.session_state.show_sample_data = False
+        st.session_state.current_page = "login"
+    
+    st.success("Logged out successfully!")
 
 def check_authentication():
     """Check if user is authenticated via Replit Auth or demo mode."""
     if is_replit_environment():
         # Use Replit Auth
-        if replit_auth.is_authenticated():
+        auth_snapshot = replit_auth._snapshot()
+        if auth_snapshot[0]:
             # Already authenticated
-            show_navigation_sidebar()
+            show_navigation_sidebar(auth_snapshot)
             return True
         else:
             # Try to authenticate
@@ -603,6 +724,82 @@ def check_authentication():
 # DATA VALIDATION FUNCTIONS
 # =============================================================================
 
+def _make_validator(required_columns: list, file_type: str) -> Callable[[pd.DataFrame], bool]:
+    """
+    Build a CSV validator specialized for one file type.
+    
+    The column sets and the numeric column list depend only on the schema,
+    so they are worked out here once instead of on every validation.
+    
+    Args:
+        required_columns (list): List of column names that must be present
+        file_type (str): Human-readable description of the file type for error messages
+        
+    Returns:
+        Callable: Function taking a DataFrame and returning the validation
+        result described in validate_csv_structure()
+    """
+    # Column membership is tested against sets; the lists keep the original
+    # column order for the messages
+    required_set = frozenset(required_columns)
+    # Identify numeric columns (all columns except 'Ingredient')
+    numeric_columns = [col for col in required_columns if col.lower() != 'ingredient']
+
+    def validate(df: pd.DataFrame) -> bool:
+        present_set = frozenset(df.columns)
+
+        # Check 1: Validate all required columns are present
+        missing_columns = [col for col in required_columns if col not in present_set]
+        if missing_columns:
+            st.error(f"{file_type} is missing required columns: {', '.join(missing_columns)}")
+            return False
+
+        # Check 2: Ensure DataFrame contains data
+        if df.empty:
+            st.error(f"{file_type} is empty. Please provide a CSV file with data.")
+            return False
+
+        # Check 3: Detect blank and duplicate ingredients (would cause data processing issues)
+        # (names are read from the column array; no row slice of the frame)
+        if 'Ingredient' in present_set:
+            ingredients = df['Ingredient']
+            # Rows without a name cannot be matched to the other files
+            blank = ingredients.isna().to_numpy() | (ingredients.astype(str).str.strip() == '').to_numpy()
+            if blank.any():
+                st.error(f"{file_type} has blank ingredient names at rows: {df.index[np.flatnonzero(blank)].tolist()}")
+                return False
+            duplicated = ingredients.duplicated().to_numpy()
+            if duplicated.any():
+                st.error(f"{file_type} contains duplicate ingredients: {', '.join(map(str, ingredients.to_numpy()[duplicated]))}")
+                return False
+
+        # Check 4: Validate numeric columns contain valid numbers
+        # (all columns are converted in one pass; non-numeric data becomes NaN)
+        values = df[numeric_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        invalid = np.isnan(values)
+        negative = values < 0
+        has_invalid = invalid.any(axis=0)
+        has_negative = negative.any(axis=0)
+        
+        for i, col in enumerate(numeric_columns):
+            # Check for non-numeric values (NaN after conversion indicates invalid data)
+            if has_invalid[i]:
+                st.error(f"{file_type} has non-numeric values in column '{col}' at rows: {df.index[np.flatnonzero(invalid[:, i])].tolist()}")
+                return False
+                
+            # Check 5: Warn about negative values (unusual but not necessarily invalid)
+            if has_negative[i]:
+                st.warning(f"{file_type} has negative values in column '{col}' at rows: {df.index[np.flatnonzero(negative[:, i])].tolist()}")
+
+        # Check 6: Warn about unexpected columns (potential typos or extra data)
+        extra_columns = [col for col in df.columns if col not in required_set]
+        if extra_columns:
+            st.warning(f"{file_type} has unexpected columns: {', '.join(extra_columns)}")
+
+        return True
+
+    return validate
+
 def validate_csv_structure(df: pd.DataFrame, required_columns: list, file_type: str) -> bool:
     """
     Comprehensive validation of CSV file structure and data quality.
@@ -622,63 +819,144 @@ def validate_csv_structure(df: pd.DataFrame, required_columns: list, file_type:
     Validation Checks:
         1. Required columns presence
         2. Empty DataFrame detection
-        3. Duplicate ingredient detection
+        3. Blank and duplicate ingredient detection
         4. Numeric data validation
         5. Negative value detection (warnings only)
         6. Unexpected column detection (warnings only)
+        
+    Note:
+        The uploaded file types have prebuilt validators in _VALIDATORS;
+        this function builds one for an arbitrary schema.
     """
-    # Check 1: Validate all required columns are present
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        st.error(f"{file_type} is missing required columns: {', '.join(missing_columns)}")
-        return False
-
-    # Check 2: Ensure DataFrame contains data
-    if df.empty:
-        st.error(f"{file_type} is empty. Please provide a CSV file with data.")
-        return False
-
-    # Check 3: Detect duplicate ingredients (would cause data processing issues)
-    if 'Ingredient' in df.columns:
-        duplicates = df[df['Ingredient'].duplicated()]
-        if not duplicates.empty:
-            st.error(f"{file_type} contains duplicate ingredients: {', '.join(duplicates['Ingredient'].tolist())}")
-            return False
-
-    # Check 4: Validate numeric columns contain valid numbers
-    # Identify numeric columns (all columns except 'Ingredient')
-    numeric_columns = [col for col in required_columns if col.lower() != 'ingredient']
-    
-    for col in numeric_columns:
-        # Convert string data to numeric, handling mixed data types
-        if df[col].dtype in ['object', 'string']:
-            converted = pd.to_numeric(df[col], errors='coerce')
-        else:
-            converted = df[col]
-            
-        # Check for non-numeric values (NaN after conversion indicates invalid data)
-        if pd.isna(converted).any():
-            invalid_rows = df[pd.isna(converted)]
-            st.error(f"{file_type} has non-numeric values in column '{col}' at rows: {invalid_rows.index.tolist()}")
-            return False
-            
-        # Check 5: Warn about negative values (unusual but not necessarily invalid)
-        negative_mask = converted < 0
-        if negative_mask.any():
-            negative_rows = df[negative_mask]
-            st.warning(f"{file_type} has negative values in column '{col}' at rows: {negative_rows.index.tolist()}")
-
-    # Check 6: Warn about unexpected columns (potential typos or extra data)
-    extra_columns = [col for col in df.columns if col not in required_columns]
-    if extra_columns:
-        st.warning(f"{file_type} has unexpected columns: {', '.join(extra_columns)}")
+    return _make_validator(required_columns, file_type)(df)
+
+# Expected columns and display name for each uploaded CSV, keyed by upload slot
+CSV_SCHEMAS = {
+    "ingredient": (["Ingredient", "Unit Cost"], "Ingredient Info CSV"),
+    "stock": (["Ingredient", "Received Qty"], "Stock CSV"),
+    "usage": (["Ingredient", "Used Qty"], "Usage CSV"),
+    "waste": (["Ingredient", "Wasted Qty"], "Waste CSV"),
+}
 
-    return True
+# Validators specialized for each schema, built once at import
+_VALIDATORS = {
+    key: _make_validator(required, file_type)
+    for key, (required, file_type) in CSV_SCHEMAS.items()
+}
 
 # =============================================================================
 # DATA PROCESSING FUNCTIONS
 # =============================================================================
 
+# Maximum number of missing ingredient names listed in the processing warning
+MAX_LISTED_MISSING = 50
+
+# Row count from which _compute_costs splits the work across threads
+PARALLEL_MIN_ROWS = 500_000
+
+# Derived columns produced by _compute_costs, in output order
+METRIC_COLUMNS = [
+    'Expected Use',       # Used + Wasted (total quantity that should have been consumed)
+    'Used Cost',          # Cost of productive usage
+    'Waste Cost',         # Cost of waste/spoilage
+    'Expected Use Cost',  # Total expected consumption cost
+    'Stocked Cost',       # Total value of received inventory
+    'Shrinkage Cost',     # Stocked Cost - Expected Use Cost
+    'Total Cost',         # Used Cost + Waste Cost + Shrinkage Cost
+]
+
+def _fill_costs(out: np.ndarray, used: np.ndarray, wasted: np.ndarray,
+                stocked: np.ndarray, unit_cost: np.ndarray) -> None:
+    """
+    Write the derived metrics for a block of rows into ``out`` in place.
+    
+    Every step writes into its output column in place, so no temporary arrays
+    are made. That is one pass per output column, the same memory traffic a
+    fused expression evaluator such as numexpr would need to materialize all
+    seven columns.
+    """
+    (expected_use, used_cost, waste_cost, expected_use_cost,
+     stocked_cost, shrinkage_cost, total_cost) = out.T
+    
+    np.add(used, wasted, out=expected_use)
+    
+    # Cost calculations: Quantity × Unit Cost for each category
+    np.multiply(used, unit_cost, out=used_cost)
+    np.multiply(wasted, unit_cost, out=waste_cost)
+    np.multiply(expected_use, unit_cost, out=expected_use_cost)
+    np.multiply(stocked, unit_cost, out=stocked_cost)
+    
+    # Shrinkage Cost: The dollar value of inventory that went missing
+    # This could indicate theft, unrecorded waste, measurement errors, etc.
+    # Formula: What we received - What we can account for = What's missing
+    np.subtract(stocked_cost, expected_use_cost, out=shrinkage_cost)
+    
+    # Total Cost: Sum of all cost impacts (productive use + waste + shrinkage)
+    np.add(used_cost, waste_cost, out=total_cost)
+    total_cost += shrinkage_cost
+
+def _compute_costs(used: np.ndarray, wasted: np.ndarray, stocked: np.ndarray,
+                   unit_cost: np.ndarray) -> np.ndarray:
+    """
+    Compute all derived quantity and cost metrics into one (N, 7) block.
+    
+    Args:
+        used, wasted, stocked (np.ndarray): Quantities per ingredient
+        unit_cost (np.ndarray): Unit cost per ingredient
+        
+    Returns:
+        np.ndarray: Column-major block with one column per METRIC_COLUMNS entry
+        
+    Note:
+        Catalogs of PARALLEL_MIN_ROWS rows or more are split into row blocks
+        computed on a thread pool; NumPy releases the GIL inside each ufunc,
+        so the blocks run in parallel and the UI thread is not blocked.
+    """
+    out = np.empty((used.size, len(METRIC_COLUMNS)), order='F')
+    
+    workers = min(os.cpu_count() or 1, used.size // PARALLEL_MIN_ROWS + 1)
+    if workers == 1:
+        _fill_costs(out, used, wasted, stocked, unit_cost)
+        return out
+    
+    bounds = np.linspace(0, used.size, workers + 1, dtype=np.intp)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        blocks = [
+            executor.submit(_fill_costs, out[start:stop], used[start:stop], wasted[start:stop],
+                            stocked[start:stop], unit_cost[start:stop])
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for block in blocks:
+            block.result()
+    return out
+
+def _gather(target_codes: np.ndarray, source_codes: np.ndarray, values: pd.Series,
+            n_codes: int) -> np.ndarray:
+    """
+    Align a quantity column to the given ingredient codes.
+    
+    Args:
+        target_codes (np.ndarray): Ingredient codes of the output rows
+        source_codes (np.ndarray): Ingredient codes of the source rows
+        values (pd.Series): Quantities for the source rows
+        n_codes (int): Number of distinct ingredient codes
+        
+    Returns:
+        np.ndarray: float64 quantities per output row; 0 where the source has no
+        record (or a missing value) for that ingredient
+    """
+    # Scatter into a dense table indexed by code, then gather the output rows;
+    # both are single integer-indexed passes with no hashing
+    lookup = np.zeros(n_codes)
+    lookup[source_codes] = _quantities(values)
+    return lookup[target_codes]
+
+def _quantities(values: pd.Series) -> np.ndarray:
+    """Return a quantity column as float64 with missing values set to 0."""
+    # (np.where returns a new array; to_numpy may be a view of the input)
+    quantities = values.to_numpy(dtype=np.float64)
+    return np.where(np.isnan(quantities), 0.0, quantities)
+
 def process_ingredient_data(ingredient_info: pd.DataFrame, input_stock: pd.DataFrame, 
                           usage: pd.DataFrame, waste: pd.DataFrame) -> pd.DataFrame:
     """
@@ -695,7 +973,11 @@ def process_ingredient_data(ingredient_info: pd.DataFrame, input_stock: pd.DataF
         waste (pd.DataFrame): Waste data with columns ['Ingredient', 'Wasted Qty']
         
     Returns:
-        pd.DataFrame: Processed DataFrame with calculated metrics, or empty DataFrame on error
+        pd.DataFrame: Processed DataFrame with calculated metrics
+        
+    Raises:
+        ValueError: If an input is missing required columns, has blank
+            ingredient names, or holds non-numeric quantities or costs
         
     Calculated Metrics:
         - Expected Use: Used + Wasted (total quantity that should have been consumed)
@@ -709,76 +991,301 @@ def process_ingredient_data(ingredient_info: pd.DataFrame, input_stock: pd.DataF
     Data Integrity Handling:
         - Missing ingredients are added with zero unit cost and warnings displayed
         - Missing data is filled with zeros to prevent calculation errors
-        - All operations are wrapped in try-catch for error handling
+        - Quantities and unit costs are read as numbers; errors are raised to
+          the caller, which reports them in the UI
     """
-    try:
-        # Step 1: Create working copy and set up base structure
-        # Use ingredient_info as the foundation since it contains unit costs
-        df = ingredient_info.copy()
-        df = df.set_index('Ingredient')  # Set ingredient names as index for easy merging
-        
-        # Step 2: Prepare other DataFrames for merging
-        # Convert all DataFrames to use Ingredient as index for consistent merging
-        usage_indexed = usage.set_index('Ingredient')
-        waste_indexed = waste.set_index('Ingredient')
-        stock_indexed = input_stock.set_index('Ingredient')
-
-        # Step 3: Handle missing ingredients across datasets
-        # Find ingredients that appear in usage/waste/stock but not in ingredient_info
-        all_indices = usage_indexed.index.union(waste_indexed.index).union(stock_indexed.index)
-        missing_ingredients = all_indices.difference(df.index)
-        
-        if not missing_ingredients.empty:
-            # Warn user about data inconsistencies
-            st.warning(
-                "The following ingredients were found in stock, usage, or waste files but "
-                "are missing from the ingredient info: "
-                + ", ".join(missing_ingredients)
-            )
-            # Add missing ingredients with zero unit cost to prevent calculation errors
-            # This ensures all ingredients appear in the final report even without cost info
-            df = df.reindex(df.index.union(missing_ingredients), fill_value=0)
-
-        # Step 4: Merge quantity data from all sources
-        # Use reindex() with fillna(0) to handle missing data gracefully
-        df['Used'] = usage_indexed['Used Qty'].reindex(df.index).fillna(0)
-        df['Wasted'] = waste_indexed['Wasted Qty'].reindex(df.index).fillna(0)
-        df['Stocked'] = stock_indexed['Received Qty'].reindex(df.index).fillna(0)
-        
-        # Step 5: Calculate derived metrics for cost analysis
-        # Expected Use: Total quantity that should have been consumed
-        df['Expected Use'] = df['Used'] + df['Wasted']
-        
-        # Cost calculations: Quantity × Unit Cost for each category
-        df['Used Cost'] = df['Used'] * df['Unit Cost']           # Cost of productive usage
-        df['Waste Cost'] = df['Wasted'] * df['Unit Cost']       # Cost of waste/spoilage
-        df['Expected Use Cost'] = df['Expected Use'] * df['Unit Cost']  # Total expected consumption cost
-        df['Stocked Cost'] = df['Stocked'] * df['Unit Cost']    # Total value of received inventory
-        
-        # Shrinkage Cost: The dollar value of inventory that went missing
-        # This could indicate theft, unrecorded waste, measurement errors, etc.
-        # Formula: What we received - What we can account for = What's missing
-        df['Shrinkage Cost'] = df['Stocked Cost'] - df['Expected Use Cost']
-        
-        # Total Cost: Sum of all cost impacts (productive use + waste + shrinkage)
-        df['Total Cost'] = df['Used Cost'] + df['Waste Cost'] + df['Shrinkage Cost']
-        
-        # Step 6: Reset index to convert Ingredient back to a regular column
-        # This makes the DataFrame easier to work with in the UI
-        df.reset_index(inplace=True)
-        
-        return df
-        
-    except Exception as e:
-        # Handle any processing errors gracefully
-        st.error(f"Error processing data: {str(e)}")
-        return pd.DataFrame()  # Return empty DataFrame to prevent crashes
+    # The cached computation returns its warnings so they are shown again
+    # when a rerun is served from the cache
+    df, warnings = _process_ingredient_data_cached(ingredient_info, input_stock, usage, waste)
+    for message in warnings:
+        st.warning(message)
+    return df
+
+def _content_digest(df: pd.DataFrame) -> tuple:
+    """Cache key for a DataFrame's contents: its column names and a hash of every row."""
+    # (Streamlit's own DataFrame hashing samples rows once frames get large,
+    # so edits outside the sample would hit the old cache entry)
+    return tuple(df.columns), pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _content_digest})
+def _process_ingredient_data_cached(ingredient_info: pd.DataFrame, input_stock: pd.DataFrame,
+                                    usage: pd.DataFrame, waste: pd.DataFrame) -> Tuple[pd.DataFrame, list]:
+    """
+    Cached body of process_ingredient_data().
+    
+    Streamlit reruns the script on every interaction; the result is keyed on
+    the input frames' contents, so unchanged uploads are not reprocessed.
+    
+    Returns:
+        tuple: (processed DataFrame, list of warning messages to display)
+    """
+    warnings = []
+    
+    # Check the input schemas up front so the processing below can run
+    # without a blanket exception handler
+    for frame, key in ((ingredient_info, "ingredient"), (input_stock, "stock"),
+                       (usage, "usage"), (waste, "waste")):
+        required, file_type = CSV_SCHEMAS[key]
+        missing_columns = [col for col in required if col not in frame.columns]
+        if missing_columns:
+            raise ValueError(f"{file_type} is missing required columns: {', '.join(missing_columns)}")
+    
+    # Step 1: Factorize ingredient names once across all four inputs
+    # Everything below works on these integer codes; no frame is ever
+    # indexed by name
+    frames = (ingredient_info, usage, waste, input_stock)
+    codes, names = pd.factorize(pd.concat([frame['Ingredient'] for frame in frames], ignore_index=True))
+    info_codes, usage_codes, waste_codes, stock_codes = np.split(
+        codes, np.cumsum([len(frame) for frame in frames[:-1]])
+    )
+    # Blank names get code -1, which would index the last ingredient in the
+    # lookups below; reject them instead of misattributing their rows
+    for frame_codes, frame, key in ((info_codes, ingredient_info, "ingredient"), (usage_codes, usage, "usage"),
+                                    (waste_codes, waste, "waste"), (stock_codes, input_stock, "stock")):
+        blank = frame_codes < 0
+        if blank.any():
+            raise ValueError(f"{CSV_SCHEMAS[key][1]} has blank ingredient names at rows: "
+                             f"{frame.index[np.flatnonzero(blank)].tolist()}")
+    # Alphabetical rank of each code; ordering by rank orders rows by name
+    # without comparing the strings again
+    name_order = names.argsort()
+    name_rank = np.empty_like(name_order)
+    name_rank[name_order] = np.arange(name_order.size)
+    
+    # Use ingredient_info as the foundation since it contains unit costs
+    # Its columns are used as arrays directly; the frame itself is not copied
+    row_codes = info_codes
+    info_columns = {col: ingredient_info[col].array for col in ingredient_info.columns if col != 'Ingredient'}
+    
+    # Fast path: when every file lists the same ingredients in the same order
+    # (typical for exports from one system) the rows already line up, so the
+    # missing-ingredient check and the gathers below are skipped
+    aligned = all(
+        other.size == info_codes.size and np.array_equal(other, info_codes)
+        for other in (usage_codes, waste_codes, stock_codes)
+    )
+    
+    # Handle missing ingredients across datasets
+    # Find ingredients that appear in usage/waste/stock but not in ingredient_info
+    # (sorted integer set operations on the codes; names are only looked
+    # up for the warning)
+    if aligned:
+        missing_ingredients = np.empty(0, dtype=info_codes.dtype)
+    else:
+        all_codes = np.unique(np.concatenate([usage_codes, waste_codes, stock_codes]))
+        missing_ingredients = np.setdiff1d(all_codes, info_codes)
+    
+    if missing_ingredients.size:
+        # Warn user about data inconsistencies
+        # (names are listed alphabetically, capped so very large gaps do not
+        # produce a huge message)
+        listed = missing_ingredients[np.argsort(name_rank[missing_ingredients])[:MAX_LISTED_MISSING]]
+        more = missing_ingredients.size - listed.size
+        warnings.append(
+            "The following ingredients were found in stock, usage, or waste files but "
+            "are missing from the ingredient info: "
+            + ", ".join(names.take(listed))
+            + (f" … (+{more} more)" if more else "")
+        )
+        # Add missing ingredients with zero unit cost to prevent calculation errors
+        # This ensures all ingredients appear in the final report even without cost info
+        # Rows are reported in ingredient name order; position -1 marks the
+        # added ingredients, whose other non-numeric fields are left empty.
+        # A single filling take both appends the zero rows and applies the
+        # order, so no reindex or separate zero-block concat is needed
+        row_codes = np.concatenate([info_codes, missing_ingredients])
+        order = np.argsort(name_rank[row_codes])
+        row_codes = row_codes[order]
+        positions = np.concatenate([np.arange(info_codes.size), np.full(missing_ingredients.size, -1)])[order]
+        info_columns = {
+            col: values.take(positions, allow_fill=True,
+                             fill_value=0 if pd.api.types.is_numeric_dtype(values.dtype) else None)
+            for col, values in info_columns.items()
+        }
+
+    # Step 2: Merge quantity data from all sources by gathering on the codes
+    # Ingredients without a quantity record are filled with 0
+    if aligned:
+        used = _quantities(usage['Used Qty'])
+        wasted = _quantities(waste['Wasted Qty'])
+        stocked = _quantities(input_stock['Received Qty'])
+    else:
+        used = _gather(row_codes, usage_codes, usage['Used Qty'], len(names))
+        wasted = _gather(row_codes, waste_codes, waste['Wasted Qty'], len(names))
+        stocked = _gather(row_codes, stock_codes, input_stock['Received Qty'], len(names))
+    
+    # Step 3: Calculate derived metrics for cost analysis
+    # Expected Use, the cost columns, Shrinkage Cost and Total Cost come
+    # from one kernel writing into a single preallocated block
+    metrics = _compute_costs(
+        used, wasted, stocked,
+        info_columns['Unit Cost'].to_numpy(dtype=np.float64)
+    )
+    
+    # Step 4: Build the result in a single DataFrame construction from the
+    # computed arrays, mapping codes back to names in a regular Ingredient
+    # column. This makes the DataFrame easier to work with in the UI
+    # Ingredient is categorical with alphabetically ordered categories, so it
+    # stores integer codes and still sorts by name
+    result = pd.DataFrame({
+        'Ingredient': pd.Categorical.from_codes(name_rank[row_codes], categories=names.take(name_order)),
+        **info_columns,
+        'Used': used,
+        'Wasted': wasted,
+        'Stocked': stocked,
+        **dict(zip(METRIC_COLUMNS, metrics.T)),
+    }, copy=False)
+    return result, warnings
 
 # =============================================================================
 # REPORT GENERATION FUNCTIONS
 # =============================================================================
 
-def create_pdf_report(df: pd.DataFrame) -> bytes:
+# Cost columns summed for the report totals
+TOTAL_COLUMNS = ['Used Cost', 'Waste Cost', 'Shrinkage Cost', 'Total Cost']
+
+def _cost_totals(df: pd.DataFrame) -> pd.Series:
+    """Sum the cost columns reported as totals, in one reduction over the frame."""
+    return df[TOTAL_COLUMNS].sum()
+
+# Row count above which create_excel_report writes the data rows as sheet XML
+# itself instead of one xlsxwriter call per row
+EXCEL_XML_MIN_ROWS = 20_000
+
+# Path of the report worksheet inside the Excel package
+EXCEL_SHEET_PATH = 'xl/worksheets/sheet1.xml'
+
+def _excel_column(values: pd.Series) -> np.ndarray:
+    """
+    Return a column as Python objects ready to write to Excel.
+    
+    Missing values become None (written as empty cells) and infinities become
+    the text 'inf' / '-inf', as pandas' to_excel writes them.
+    """
+    column = values.to_numpy(dtype=object)
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.to_numpy(dtype=np.float64)
+        column[np.isposinf(numbers)] = 'inf'
+        column[np.isneginf(numbers)] = '-inf'
+    column[pd.isna(column)] = None
+    return column
+
+def _cell_xml(ref: str, style: str, value) -> str:
+    """Return the <c> element for one worksheet cell ('' for an empty cell)."""
+    if value is None:
+        return ''
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.number)):
+        return f'<c r="{ref}"{style}><v>{value:.16G}</v></c>'
+    text = str(value)
+    # Leading or trailing whitespace is only kept when marked as preserved
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+def _sheet_rows_xml(df: pd.DataFrame, column_styles: Dict[int, str]) -> str:
+    """
+    Render the data rows of ``df`` as worksheet XML, starting at sheet row 2.
+    
+    Cells are written column by column and then joined row by row. Numbers use
+    the same text form as xlsxwriter; all text is written as inline strings.
+    
+    Args:
+        df (pd.DataFrame): Data to write
+        column_styles (dict): Cell style index by column position, for columns
+            with a number format
+    """
+    from xlsxwriter.utility import xl_col_to_name  # Excel column letters
+    
+    row_refs = [str(row_num) for row_num in range(2, len(df) + 2)]
+    columns = []
+    for col_idx, col_name in enumerate(df.columns):
+        letter = xl_col_to_name(col_idx)
+        style = f' s="{column_styles[col_idx]}"' if col_idx in column_styles else ''
+        values = df[col_name]
+        if values.dtype == np.float64:
+            # Plain float columns skip the per-value type checks; only missing
+            # and infinite values need the generic path
+            numbers = values.to_numpy()
+            finite = np.isfinite(numbers)
+            cells = [
+                f'<c r="{letter}{row_ref}"{style}><v>{number:.16G}</v></c>'
+                for row_ref, number in zip(row_refs, numbers.tolist())
+            ]
+            if not finite.all():
+                for row_idx, value in zip(np.flatnonzero(~finite), _excel_column(values)[~finite]):
+                    cells[row_idx] = _cell_xml(f'{letter}{row_refs[row_idx]}', style, value)
+        else:
+            cells = [
+                _cell_xml(f'{letter}{row_ref}', style, value)
+                for row_ref, value in zip(row_refs, _excel_column(values).tolist())
+            ]
+        columns.append(cells)
+    return ''.join(
+        f'<row r="{row_ref}">{"".join(row)}</row>'
+        for row_ref, *row in zip(row_refs, *columns)
+    )
+
+def _insert_sheet_rows(workbook: bytes, df: pd.DataFrame) -> bytes:
+    """
+    Write the data rows of ``df`` into a finished report workbook.
+    
+    The workbook is written by xlsxwriter with only the header and summary
+    rows; the data rows are rendered as XML and placed after the header row,
+    with every other part of the package copied unchanged.
+    """
+    with zipfile.ZipFile(io.BytesIO(workbook)) as source:
+        sheet = source.read(EXCEL_SHEET_PATH).decode('utf-8')
+        # Data cells take the style of their column's number format, as
+        # xlsxwriter applies it
+        column_styles = {}
+        for col_min, col_max, style in re.findall(r'<col min="(\d+)" max="(\d+)"[^>]*? style="(\d+)"', sheet):
+            column_styles.update(dict.fromkeys(range(int(col_min) - 1, int(col_max)), style))
+        header_end = sheet.index('</row>') + len('</row>')
+        sheet = sheet[:header_end] + _sheet_rows_xml(df, column_styles) + sheet[header_end:]
+        
+        # The sheet XML is large and repetitive; the fastest compression level
+        # costs little in file size and most of the time otherwise spent here
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                data = sheet.encode('utf-8') if item.filename == EXCEL_SHEET_PATH else source.read(item)
+                target.writestr(item, data, compresslevel=1)
+    return output.getvalue()
+
+# Format of the generation timestamp shown in reports
+REPORT_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _stamp_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Record when a processed report was generated, in ``df.attrs``."""
+    df.attrs['generated_at'] = datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
+    return df
+
+def _report_timestamp(df: pd.DataFrame) -> str:
+    """Return the report's generation timestamp, or the current time if it has none."""
+    return df.attrs.get('generated_at') or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
+
+def _format_column(values: pd.Series, fmt: str) -> np.ndarray:
+    """Format a numeric column with a printf-style pattern in one vectorized call."""
+    return np.char.mod(fmt, values.to_numpy(dtype=np.float64))
+
+# PDF table layout
+# Column widths are carefully chosen to fit content while maintaining readability
+PDF_COL_WIDTHS = (30, 18, 15, 15, 18, 25, 20, 20, 25)  # Widths in mm for each column
+PDF_HEADERS = ('Ingredient', 'Unit Cost', 'Used', 'Wasted', 'Stocked', 'Shrinkage Cost', 'Used Cost', 'Waste Cost', 'Total Cost')
+PDF_CELL_FORMATS = ('$%.2f', '%.1f', '%.1f', '%.1f', '$%.2f', '$%.2f', '$%.2f', '$%.2f')  # All columns after Ingredient
+PDF_ROW_HEIGHT = 6      # Data row height in mm
+PDF_TABLE_BOTTOM = 250  # A new page starts once a row would begin below this y position
+
+def _draw_pdf_table_header(pdf: "FPDF") -> None:
+    """Draw the table header row and leave the data row font selected."""
+    pdf.set_font("Arial", "B", 7)
+    for width, header in zip(PDF_COL_WIDTHS, PDF_HEADERS):
+        pdf.cell(width, 8, header, border=1, align="C")
+    pdf.ln()
+    pdf.set_font("Arial", size=6)  # Smaller font for data rows
+
+def create_pdf_report(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> bytes:
     """
     Generate a professionally formatted PDF report from the processed ingredient data.
     
@@ -790,6 +1297,8 @@ def create_pdf_report(df: pd.DataFrame) -> bytes:
     
     Args:
         df (pd.DataFrame): Processed ingredient data with all calculated metrics
+        totals (pd.Series, optional): Cost totals from _cost_totals(df), if the
+            caller already has them
         
     Returns:
         bytes: PDF file content as bytes, ready for download
@@ -801,6 +1310,8 @@ def create_pdf_report(df: pd.DataFrame) -> bytes:
         - Summary totals at the end
         - Proper currency and number formatting
     """
+    from fpdf import FPDF  # PDF generation library
+    
     # Initialize PDF document with default settings
     pdf = FPDF()
     pdf.add_page()
@@ -809,44 +1320,35 @@ def create_pdf_report(df: pd.DataFrame) -> bytes:
     pdf.set_font("Arial", "B", 16)
     pdf.cell(0, 10, "Restaurant Ingredient Tracking Report", ln=True, align="C")
     pdf.set_font("Arial", size=10)
-    pdf.cell(0, 8, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True, align="C")
+    pdf.cell(0, 8, f"Generated on: {_report_timestamp(df)}", ln=True, align="C")
     pdf.ln(10)  # Add spacing after header
     
-    # Create table headers with optimized column widths
-    pdf.set_font("Arial", "B", 7)
-    # Column widths are carefully chosen to fit content while maintaining readability
-    col_widths = [30, 18, 15, 15, 18, 25, 20, 20, 25]  # Widths in mm for each column
-    headers = ['Ingredient', 'Unit Cost', 'Used', 'Wasted', 'Stocked', 'Shrinkage Cost', 'Used Cost', 'Waste Cost', 'Total Cost']
-    
-    # Draw table header row
-    for i, header in enumerate(headers):
-        pdf.cell(col_widths[i], 8, header, border=1, align="C")
-    pdf.ln()
-    
     # Process each ingredient row in the data
-    pdf.set_font("Arial", size=6)  # Smaller font for data rows
-    for _, row in df.iterrows():
-        # Check if we need a new page (pagination)
-        if pdf.get_y() > 250:  # If close to bottom of page
-            pdf.add_page()
-            # Re-add headers on new page for continuity
-            pdf.set_font("Arial", "B", 7)
-            for i, header in enumerate(headers):
-                pdf.cell(col_widths[i], 8, header, border=1, align="C")
+    # Columns are pulled out as arrays once and walked together, rather than
+    # boxing every row into a Series; names are truncated and numbers are
+    # formatted up front, one vectorized pass per column
+    names = [str(name)[:20] for name in df['Ingredient'].to_numpy()]  # Truncate long names
+    cells = [_format_column(df[col], fmt) for col, fmt in zip(PDF_HEADERS[1:], PDF_CELL_FORMATS)]
+    rows = zip(names, *cells)
+    
+    # Pagination: the rows that fit below the header are counted up front,
+    # so each page draws its header once and then only data rows
+    remaining = len(names)
+    _draw_pdf_table_header(pdf)
+    while True:
+        page_rows = min(remaining, int((PDF_TABLE_BOTTOM - pdf.get_y()) // PDF_ROW_HEIGHT) + 1)
+        for name, *row in islice(rows, page_rows):
+            # Add data row with proper formatting
+            pdf.cell(PDF_COL_WIDTHS[0], PDF_ROW_HEIGHT, name, border=1)
+            for width, text in zip(PDF_COL_WIDTHS[1:], row):
+                pdf.cell(width, PDF_ROW_HEIGHT, text, border=1, align="R")
             pdf.ln()
-            pdf.set_font("Arial", size=6)
-        
-        # Add data row with proper formatting
-        pdf.cell(col_widths[0], 6, str(row['Ingredient'])[:20], border=1)  # Truncate long names
-        pdf.cell(col_widths[1], 6, f"${row['Unit Cost']:.2f}", border=1, align="R")
-        pdf.cell(col_widths[2], 6, f"{row['Used']:.1f}", border=1, align="R")
-        pdf.cell(col_widths[3], 6, f"{row['Wasted']:.1f}", border=1, align="R")
-        pdf.cell(col_widths[4], 6, f"{row['Stocked']:.1f}", border=1, align="R")
-        pdf.cell(col_widths[5], 6, f"${row['Shrinkage Cost']:.2f}", border=1, align="R")
-        pdf.cell(col_widths[6], 6, f"${row['Used Cost']:.2f}", border=1, align="R")
-        pdf.cell(col_widths[7], 6, f"${row['Waste Cost']:.2f}", border=1, align="R")
-        pdf.cell(col_widths[8], 6, f"${row['Total Cost']:.2f}", border=1, align="R")
-        pdf.ln()
+        remaining -= page_rows
+        if not remaining:
+            break
+        # Re-add headers on new page for continuity
+        pdf.add_page()
+        _draw_pdf_table_header(pdf)
     
     # Add summary section with totals
     pdf.ln(10)  # Add spacing before summary
@@ -855,10 +1357,12 @@ def create_pdf_report(df: pd.DataFrame) -> bytes:
     pdf.set_font("Arial", size=10)
     
     # Calculate summary totals
-    total_used_cost = df['Used Cost'].sum()
-    total_waste_cost = df['Waste Cost'].sum()
-    total_shrinkage_cost = df['Shrinkage Cost'].sum()
-    grand_total = df['Total Cost'].sum()
+    if totals is None:
+        totals = _cost_totals(df)
+    total_used_cost = totals['Used Cost']
+    total_waste_cost = totals['Waste Cost']
+    total_shrinkage_cost = totals['Shrinkage Cost']
+    grand_total = totals['Total Cost']
     
     # Display summary totals
     pdf.cell(0, 6, f"Total Used Cost: ${total_used_cost:.2f}", ln=True)
@@ -867,23 +1371,25 @@ def create_pdf_report(df: pd.DataFrame) -> bytes:
     pdf.cell(0, 6, f"Grand Total Cost: ${grand_total:.2f}", ln=True)
     
     # Generate and return PDF as bytes
-    pdf_output = pdf.output(dest='S')  # Generate PDF content
-    # Handle different FPDF versions (some return string, others bytes)
-    if isinstance(pdf_output, str):
-        return pdf_output.encode('latin1')
-    return bytes(pdf_output)
-
-def create_excel_report(df: pd.DataFrame) -> bytes:
-    """Generate an Excel report from the dataframe."""
+    # (fpdf2 builds the document in a bytearray; no string round trip)
+    return bytes(pdf.output())
+
+def create_excel_report(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> bytes:
+    """Generate an Excel report from the dataframe.
+
+    ``totals`` may be passed from _cost_totals() on the same frame to skip
+    summing the cost columns again.
+    """
     output = io.BytesIO()
     
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Write the main data
-        df.to_excel(writer, sheet_name='Ingredient Report', index=False)
-        
+    # constant_memory streams each row to disk as it is written instead of
+    # holding every cell in memory until the workbook closes; rows must then
+    # be written in order, so formats and widths are set before the data
+    with pd.ExcelWriter(output, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}) as writer:
         # Get workbook and worksheet objects
         workbook = writer.book
-        worksheet = writer.sheets['Ingredient Report']
+        worksheet = workbook.add_worksheet('Ingredient Report')
         
         # Add formatting
         header_format = workbook.add_format({
@@ -897,31 +1403,39 @@ def create_excel_report(df: pd.DataFrame) -> bytes:
         money_format = workbook.add_format({'num_format': '$#,##0.00'})
         number_format = workbook.add_format({'num_format': '#,##0.00'})
         
-        # Apply header formatting
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-        
         # Apply number formatting to appropriate columns
+        col_idx_map = {col_name: col_idx for col_idx, col_name in enumerate(df.columns)}
         for col_name in MONEY_COLUMNS:
-            if col_name in df.columns:
-                col_idx = df.columns.get_loc(col_name)
+            if col_name in col_idx_map:
+                col_idx = col_idx_map[col_name]
                 worksheet.set_column(col_idx, col_idx, 12, money_format)
 
         for col_name in NUMBER_COLUMNS:
-            if col_name in df.columns:
-                col_idx = df.columns.get_loc(col_name)
+            if col_name in col_idx_map:
+                col_idx = col_idx_map[col_name]
                 worksheet.set_column(col_idx, col_idx, 10, number_format)
         
+        # Write the header and then the main data, one row per call
+        # Missing values are written as empty cells; large frames get their
+        # data rows written as sheet XML once the workbook is closed
+        worksheet.write_row(0, 0, df.columns.tolist(), header_format)
+        if len(df) <= EXCEL_XML_MIN_ROWS:
+            columns = [_excel_column(df[col]).tolist() for col in df.columns]
+            for row_num, row in enumerate(zip(*columns), start=1):
+                worksheet.write_row(row_num, 0, row)
+        
         # Add summary totals with additional insights
         start_row = len(df) + 3
         bold_format = workbook.add_format({'bold': True})
         
         worksheet.write(start_row, 0, 'Summary Totals:', bold_format)
         
-        total_used = df['Used Cost'].sum()
-        total_waste = df['Waste Cost'].sum()
-        total_shrinkage = df['Shrinkage Cost'].sum()
-        grand_total = df['Total Cost'].sum()
+        if totals is None:
+            totals = _cost_totals(df)
+        total_used = totals['Used Cost']
+        total_waste = totals['Waste Cost']
+        total_shrinkage = totals['Shrinkage Cost']
+        grand_total = totals['Total Cost']
         
         worksheet.write(start_row + 1, 0, 'Total Used Cost:')
         worksheet.write(start_row + 1, 1, total_used, money_format)
@@ -939,12 +1453,53 @@ def create_excel_report(df: pd.DataFrame) -> bytes:
         
         # Add generation timestamp
         worksheet.write(start_row + 6, 0, 'Report Generated:')
-        worksheet.write(start_row + 6, 1, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        worksheet.write(start_row + 6, 1, _report_timestamp(df))
     
     output.seek(0)
+    if len(df) > EXCEL_XML_MIN_ROWS:
+        return _insert_sheet_rows(output.getvalue(), df)
+    return output.getvalue()
+
+
+def create_parquet_report(df: pd.DataFrame) -> bytes:
+    """Generate a Parquet file of the processed data.
+
+    Unformatted and without the summary block, for loading into other tools;
+    Arrow's writer makes this much faster than the Excel export on large data.
+    """
+    output = io.BytesIO()
+    df.to_parquet(output, engine='pyarrow', compression='snappy', index=False)
     return output.getvalue()
 
 
+def _read_uploaded_csv(file, key: str) -> Optional[pd.DataFrame]:
+    """Read and validate an uploaded CSV; None if it fails validation."""
+    # Streamlit reruns the script on every interaction; parsing and
+    # validation are cached on the file's bytes so unchanged uploads are
+    # neither parsed nor validated again
+    return _load_csv(file.getvalue(), key)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_csv(data: bytes, key: str) -> Optional[pd.DataFrame]:
+    """
+    Cached body of _read_uploaded_csv().
+    
+    The validator's error and warning messages are recorded with the
+    result and replayed by Streamlit when a rerun is served from the cache.
+    """
+    df = _parse_csv(data)
+    return df if _VALIDATORS[key](df) else None
+
+def _parse_csv(data: bytes) -> pd.DataFrame:
+    """Parse CSV file contents, with Arrow's parser where the file allows it."""
+    try:
+        # Arrow's multithreaded CSV parser (pyarrow ships with Streamlit)
+        return pd.read_csv(io.BytesIO(data), engine="pyarrow")
+    except pd.errors.ParserError:
+        # Arrow rejects rows with missing trailing fields; pandas' own parser
+        # reads them with the missing values left empty
+        return pd.read_csv(io.BytesIO(data))
+
 def handle_file_upload() -> Tuple[
     Optional[pd.DataFrame],
     Optional[pd.DataFrame],
@@ -997,19 +1552,19 @@ def handle_file_upload() -> Tuple[
 
     dfs = []
     uploads = [
-        (ingredient_file, ["Ingredient", "Unit Cost"], "Ingredient Info CSV"),
-        (stock_file, ["Ingredient", "Received Qty"], "Stock CSV"),
-        (usage_file, ["Ingredient", "Used Qty"], "Usage CSV"),
-        (waste_file, ["Ingredient", "Wasted Qty"], "Waste CSV"),
+        (ingredient_file, "ingredient"),
+        (stock_file, "stock"),
+        (usage_file, "usage"),
+        (waste_file, "waste"),
     ]
 
-    for file, required, msg in uploads:
+    for file, key in uploads:
         if file is None:
             dfs.append(None)
             continue
+        msg = CSV_SCHEMAS[key][1]
         try:
-            df = pd.read_csv(file)
-            dfs.append(df if validate_csv_structure(df, required, msg) else None)
+            dfs.append(_read_uploaded_csv(file, key))
         except Exception as e:
             st.error(f"❌ Error reading {msg}: {str(e)}")
             dfs.append(None)
@@ -1039,20 +1594,72 @@ def generate_report(
     assert usage_df is not None
     assert waste_df is not None
     
-    processed_df = process_ingredient_data(ingredient_df, stock_df, usage_df, waste_df)
+    try:
+        processed_df = _stamp_report(process_ingredient_data(ingredient_df, stock_df, usage_df, waste_df))
+    except Exception as e:
+        # Handle any processing errors gracefully
+        st.error(f"Error processing data: {str(e)}")
+        return None
     return processed_df if not processed_df.empty else None
 
 
-def display_results(df: pd.DataFrame) -> None:
-    """Render summary metrics and a detailed results table."""
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _content_digest})
+def _results_table(df: pd.DataFrame, sort_by: str, only_issues: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build the detailed results table shown by display_results().
+    
+    Args:
+        df (pd.DataFrame): Processed ingredient data
+        sort_by (str): Column to sort by; ingredient names ascending, costs descending
+        only_issues (bool): Keep only items with shrinkage over $10
+        
+    Returns:
+        tuple: (filtered and sorted DataFrame, DataFrame of CSS styles with the
+        same shape for highlighting)
+    """
+    # Apply filters and sorting
+    filtered_df = df
+    if only_issues:
+        filtered_df = filtered_df[filtered_df['Shrinkage Cost'] > 10]
+    
+    # Sort the dataframe
+    ascending = sort_by == "Ingredient"  # Sort ingredient names ascending, costs descending
+    filtered_df = filtered_df.sort_values(by=sort_by, ascending=ascending)
+    
+    # Highlight rows from the numeric values
+    # Both conditions are evaluated for all rows at once; high shrinkage is
+    # assigned last so it wins where both apply
+    high_shrinkage = filtered_df['Shrinkage Cost'].to_numpy() > 10
+    missing_stock = (filtered_df['Stocked'].to_numpy() == 0) & (
+        (filtered_df['Used'].to_numpy() > 0) | (filtered_df['Wasted'].to_numpy() > 0)
+    )
+    row_styles = np.full(len(filtered_df), 'background-color: white; color: #000000;', dtype=object)  # White background with black text
+    row_styles[missing_stock] = 'background-color: #fff3e0; color: #000000;'  # Light orange with black text
+    row_styles[high_shrinkage] = 'background-color: #ffebee; color: #000000;'  # Light red with black text
+    
+    # Every cell in a row shares the row's style
+    styles = pd.DataFrame(
+        np.repeat(row_styles[:, None], len(filtered_df.columns), axis=1),
+        index=filtered_df.index, columns=filtered_df.columns
+    )
+    return filtered_df, styles
+
+def display_results(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> None:
+    """Render summary metrics and a detailed results table.
+
+    ``totals`` may be passed from _cost_totals() on the same frame to skip
+    summing the cost columns again.
+    """
 
     st.header("📋 Report Results")
 
     # Calculate key metrics
-    total_used_cost = df['Used Cost'].sum()
-    total_waste_cost = df['Waste Cost'].sum()
-    total_shrinkage_cost = df['Shrinkage Cost'].sum()
-    grand_total_cost = df['Total Cost'].sum()
+    if totals is None:
+        totals = _cost_totals(df)
+    total_used_cost = totals['Used Cost']
+    total_waste_cost = totals['Waste Cost']
+    total_shrinkage_cost = totals['Shrinkage Cost']
+    grand_total_cost = totals['Total Cost']
     
     # Calculate percentages for better insights
     waste_percentage = (total_waste_cost / grand_total_cost * 100) if grand_total_cost > 0 else 0
@@ -1072,8 +1679,12 @@ def display_results(df: pd.DataFrame) -> None:
         st.metric("Grand Total Cost", f"${grand_total_cost:.2f}")
 
     # Add insights section
-    high_shrinkage_items = df[df['Shrinkage Cost'] > 10]
-    missing_stock_items = df[df['Stocked'] == 0]
+    # Boolean masks are computed once; counts and totals are taken from them
+    # without building filtered copies of the frame
+    high_shrinkage = df['Shrinkage Cost'].to_numpy() > 10
+    missing_stock = df['Stocked'].to_numpy() == 0
+    high_shrinkage_count = int(high_shrinkage.sum())
+    missing_stock_count = int(missing_stock.sum())
     
     if waste_percentage > 5 or shrinkage_percentage > 5:
         st.warning("💡 **Insights**: " + 
@@ -1081,13 +1692,13 @@ def display_results(df: pd.DataFrame) -> None:
                   (f"High shrinkage percentage ({shrinkage_percentage:.1f}%). " if shrinkage_percentage > 5 else "") +
                   "Consider reviewing inventory management processes.")
     
-    if not high_shrinkage_items.empty:
-        st.error(f"⚠️ **Alert**: {len(high_shrinkage_items)} Items have Shrinkage totaling ${high_shrinkage_items['Shrinkage Cost'].sum():.2f}")
+    if high_shrinkage_count:
+        st.error(f"⚠️ **Alert**: {high_shrinkage_count} Items have Shrinkage totaling ${df.loc[high_shrinkage, 'Shrinkage Cost'].sum():.2f}")
     
-    if not missing_stock_items.empty:
-        st.warning(f"📦 **Missing Stock**: {len(missing_stock_items)} ingredients show zero stocked quantities but have usage or waste. "
-                  f"Items: {', '.join(missing_stock_items['Ingredient'].head(5).tolist())}"
-                  f"{' and others...' if len(missing_stock_items) > 5 else ''}")
+    if missing_stock_count:
+        st.warning(f"📦 **Missing Stock**: {missing_stock_count} ingredients show zero stocked quantities but have usage or waste. "
+                  f"Items: {', '.join(df.loc[missing_stock, 'Ingredient'].head(5).tolist())}"
+                  f"{' and others...' if missing_stock_count > 5 else ''}")
 
     st.subheader("Detailed Results")
     
@@ -1098,52 +1709,21 @@ def display_results(df: pd.DataFrame) -> None:
     with col2:
         sort_by = st.selectbox("Sort by", ["Ingredient", "Total Cost", "Waste Cost", "Shrinkage Cost"], index=3)
     
-    # Apply filters and sorting
-    filtered_df = df.copy()
-    if show_only_issues:
-        filtered_df = filtered_df[filtered_df['Shrinkage Cost'] > 10]
-    
-    # Sort the dataframe
-    ascending = sort_by == "Ingredient"  # Sort ingredient names ascending, costs descending
-    filtered_df = filtered_df.sort_values(by=sort_by, ascending=ascending)
+    # Filtering, sorting, formatting and highlighting are cached, so reruns
+    # that do not change the data or these options reuse the table
+    display_df, styles = _results_table(df, sort_by, show_only_issues)
     
-    # Format the display dataframe
-    display_df = filtered_df.copy()
-    
-    # First format the numbers before applying styling
-    for col in MONEY_COLUMNS:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].apply(lambda x: f"${x:.2f}")
-
-    for col in NUMBER_COLUMNS:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].apply(lambda x: f"{x:.2f}")
-    
-    # Create highlighting function using the original numeric values before formatting
-    def highlight_issues(row):
-        try:
-            # Get the corresponding row from filtered_df using the same index
-            original_row = filtered_df.loc[row.name]
-            
-            # Check conditions using original numeric values
-            high_shrinkage = original_row['Shrinkage Cost'] > 10
-            missing_stock = original_row['Stocked'] == 0 and (original_row['Used'] > 0 or original_row['Wasted'] > 0)
-            
-            if high_shrinkage:
-                return ['background-color: #ffebee; color: #000000;'] * len(row)  # Light red with black text
-            elif missing_stock:
-                return ['background-color: #fff3e0; color: #000000;'] * len(row)  # Light orange with black text
-            else:
-                return ['background-color: white; color: #000000;'] * len(row)  # White background with black text
-        except:
-            return ['background-color: white; color: #000000;'] * len(row)  # Default to white if any error
+    # Numbers stay numeric in the table and are only formatted for display,
+    # so the table's own column sorting still compares values
+    formats = {col: '${:.2f}'.format for col in MONEY_COLUMNS if col in display_df.columns}
+    formats.update({col: '{:.2f}'.format for col in NUMBER_COLUMNS if col in display_df.columns})
     
     # Apply styling and display
-    styled_df = display_df.style.apply(highlight_issues, axis=1)
+    styled_df = display_df.style.format(formats).apply(lambda _: styles, axis=None)
     st.dataframe(styled_df, use_container_width=True, height=400)
     
     # Show record count and legend
-    st.caption(f"Showing {len(filtered_df)} of {len(df)} ingredients")
+    st.caption(f"Showing {len(display_df)} of {len(df)} ingredients")
     
     # Add legend for visual indicators
     col1, col2, col3 = st.columns(3)
@@ -1153,19 +1733,37 @@ def display_results(df: pd.DataFrame) -> None:
         st.markdown("🟠 **Orange highlighting**: Missing stock but has usage/waste")
     with col3:
         if show_only_issues:
-            st.info(f"Filtered to show {len(filtered_df)} items with shrinkage > $10")
+            st.info(f"Filtered to show {len(display_df)} items with shrinkage > $10")
+
+
+def _frame_digest(df: pd.DataFrame) -> tuple:
+    """Cache key for a report frame: its generation timestamp and _content_digest()."""
+    # The timestamp is part of the key so a regenerated report gets its own
+    # export files even when the data is unchanged
+    return df.attrs.get('generated_at'), *_content_digest(df)
 
+# The export files are cached per report, so exporting the same report again
+# returns the file built the first time
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_digest})
+def _cached_excel_report(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> bytes:
+    """Cached create_excel_report()."""
+    return create_excel_report(df, totals)
 
-def render_export_buttons(df: pd.DataFrame) -> None:
-    """Display buttons for exporting the report to Excel or PDF."""
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_digest})
+def _cached_pdf_report(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> bytes:
+    """Cached create_pdf_report()."""
+    return create_pdf_report(df, totals)
+
+def render_export_buttons(df: pd.DataFrame, totals: Optional[pd.Series] = None) -> None:
+    """Display buttons for exporting the report to Excel, PDF or Parquet."""
 
     st.header("📤 Export Options")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
 
     with col1:
         if st.button("📊 Export to Excel", type="secondary"):
             try:
-                excel_data = create_excel_report(df)
+                excel_data = _cached_excel_report(df, totals)
                 st.download_button(
                     label="⬇️ Download Excel Report",
                     data=excel_data,
@@ -1178,7 +1776,7 @@ def render_export_buttons(df: pd.DataFrame) -> None:
     with col2:
         if st.button("📄 Export to PDF", type="secondary"):
             try:
-                pdf_data = create_pdf_report(df)
+                pdf_data = _cached_pdf_report(df, totals)
                 st.download_button(
                     label="⬇️ Download PDF Report",
                     data=pdf_data,
@@ -1188,6 +1786,19 @@ def render_export_buttons(df: pd.DataFrame) -> None:
             except Exception as e:
                 st.error(f"❌ Error creating PDF report: {str(e)}")
 
+    with col3:
+        if st.button("🗃️ Export to Parquet", type="secondary"):
+            try:
+                parquet_data = create_parquet_report(df)
+                st.download_button(
+                    label="⬇️ Download Parquet Data",
+                    data=parquet_data,
+                    file_name="ingredient_report.parquet",
+                    mime="application/vnd.apache.parquet",
+                )
+            except Exception as e:
+                st.error(f"❌ Error creating Parquet file: {str(e)}")
+
 def show_dashboard_page():
     """
     Display the main dashboard page with data upload and processing.
@@ -1226,22 +1837,23 @@ def show_dashboard_page():
     # Quick stats at the top if data exists
     if st.session_state.processed_data is not None and not st.session_state.processed_data.empty:
         df = st.session_state.processed_data
+        totals = _cost_totals(df)
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_cost = df['Total Cost'].sum()
+            total_cost = totals['Total Cost']
             st.metric("Total Cost", f"${total_cost:,.2f}")
         
         with col2:
-            waste_cost = df['Waste Cost'].sum()
+            waste_cost = totals['Waste Cost']
             st.metric("Waste Cost", f"${waste_cost:,.2f}")
         
         with col3:
-            shrinkage_cost = df['Shrinkage Cost'].sum()
+            shrinkage_cost = totals['Shrinkage Cost']
             st.metric("Shrinkage Cost", f"${shrinkage_cost:,.2f}")
         
         with col4:
-            high_shrinkage = len(df[df['Shrinkage Cost'] > 10])
+            high_shrinkage = int((df['Shrinkage Cost'].to_numpy() > 10).sum())
             st.metric("High Shrinkage Items", high_shrinkage)
         
         st.markdown("---")
@@ -1254,12 +1866,12 @@ def show_dashboard_page():
         with col1:
             if st.button("📋 Load Sample Data", type="secondary"):
                 try:
-                    ingredient_df = pd.read_csv("sample_ingredient_info.csv")
-                    stock_df = pd.read_csv("sample_input_stock.csv") 
-                    usage_df = pd.read_csv("sample_usage.csv")
-                    waste_df = pd.read_csv("sample_waste.csv")
+                    ingredient_df = pd.read_csv("sample_ingredient_info.csv", engine="pyarrow")
+                    stock_df = pd.read_csv("sample_input_stock.csv", engine="pyarrow")
+                    usage_df = pd.read_csv("sample_usage.csv", engine="pyarrow")
+                    waste_df = pd.read_csv("sample_waste.csv", engine="pyarrow")
                     
-                    processed_df = process_ingredient_data(ingredient_df, stock_df, usage_df, waste_df)
+                    processed_df = _stamp_report(process_ingredient_data(ingredient_df, stock_df, usage_df, waste_df))
                     if not processed_df.empty:
                         st.session_state.processed_data = processed_df
                         st.session_state.show_sample_data = True
@@ -1301,9 +1913,7 @@ def show_analytics_page():
     
     if st.session_state.get('processed_data') is None or st.session_state.processed_data.empty:
         st.warning("No data available. Please go to the Dashboard to upload data first.")
-        if st.button("🏠 Go to Dashboard"):
-            st.session_state.current_page = "dashboard"
-            st.rerun()
+        st.button("🏠 Go to Dashboard", on_click=_go_to_page, args=("dashboard",))
         return
     
     df = st.session_state.processed_data
@@ -1346,12 +1956,11 @@ def show_reports_page():
     
     if st.session_state.get('processed_data') is None or st.session_state.processed_data.empty:
         st.warning("No data available. Please go to the Dashboard to upload data first.")
-        if st.button("🏠 Go to Dashboard"):
-            st.session_state.current_page = "dashboard"
-            st.rerun()
+        st.button("🏠 Go to Dashboard", on_click=_go_to_page, args=("dashboard",))
         return
     
     df = st.session_state.processed_data
+    totals = _cost_totals(df)
     
     # Report summary
     st.subheader("Report Summary")
@@ -1359,20 +1968,20 @@ def show_reports_page():
     
     with col1:
         st.metric("Total Items", len(df))
-        st.metric("Items with High Shrinkage", len(df[df['Shrinkage Cost'] > 10]))
+        st.metric("Items with High Shrinkage", int((df['Shrinkage Cost'].to_numpy() > 10).sum()))
     
     with col2:
-        st.metric("Total Investment", f"${df['Total Cost'].sum():,.2f}")
-        st.metric("Total Waste", f"${df['Waste Cost'].sum():,.2f}")
+        st.metric("Total Investment", f"${totals['Total Cost']:,.2f}")
+        st.metric("Total Waste", f"${totals['Waste Cost']:,.2f}")
     
     with col3:
-        waste_percentage = (df['Waste Cost'].sum() / df['Total Cost'].sum()) * 100
-        shrinkage_percentage = (df['Shrinkage Cost'].sum() / df['Total Cost'].sum()) * 100
+        waste_percentage = (totals['Waste Cost'] / totals['Total Cost']) * 100
+        shrinkage_percentage = (totals['Shrinkage Cost'] / totals['Total Cost']) * 100
         st.metric("Waste %", f"{waste_percentage:.1f}%")
         st.metric("Shrinkage %", f"{shrinkage_percentage:.1f}%")
     
     st.markdown("---")
-    render_export_buttons(df)
+    render_export_buttons(df, totals)
 
 def show_settings_page():
     """Display settings and help information."""
@@ -1454,6 +2063,7 @@ def show_settings_page():
     st.markdown("---")
     st.subheader("Data Management")
     if st.button("🗑️ Clear All Data", type="secondary"):
+        st.cache_data.clear()  # Drop cached reports and tables as well
         st.session_state.processed_data = None
         st.session_state.show_sample_data = False
         st.success("All data cleared!")
@@ -1504,8 +2114,8 @@ def main():
     elif st.session_state.current_page == "settings":
         show_settings_page()       # Configuration and help information
     else:
-        # Fallback for invalid page states (should not normally occur)
-        st.session_state.current_page = "dashboard"
+        # Fallback for invalid page states (should not normally occur; the
+        # sidebar resets unknown pages before the navigation radio is drawn)
         show_dashboard_page()
 
 # Application initialization - only run when script is executed directly
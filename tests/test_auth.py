@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+# Ensure the application module can be imported when tests run from any path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import app
+from app import ReplitAuth
+
+
+class FakeSessionState(dict):
+    """Minimal stand-in for st.session_state supporting attribute access."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as e:
+            raise AttributeError(key) from e
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def test_clear_session_removes_auth_keys(monkeypatch):
+    state = FakeSessionState(
+        replit_auth=True,
+        replit_user={'username': 'chef'},
+        demo_username='admin',
+        processed_data=object(),
+        show_sample_data=True,
+        current_page='analytics',
+        unrelated_widget=3,
+    )
+    monkeypatch.setattr(st, "session_state", state)
+
+    ReplitAuth().clear_session()
+
+    assert state == {'replit_auth': False, 'current_page': 'login', 'unrelated_widget': 3}
+
+
+def test_verify_demo_password():
+    assert app.verify_demo_password("admin", "admin123")
+    assert not app.verify_demo_password("admin", "manager456")
+    assert not app.verify_demo_password("nobody", "admin123")
+    assert not app.verify_demo_password("admin", "admín123")
+
+
+def test_get_replit_user_info(monkeypatch):
+    env = app.ReplitEnv(repl_id='abc123', repl_owner='owner', replit_user='chef', replit_domains=None)
+    monkeypatch.setattr(app, "IS_REPLIT_ENV", True)
+    monkeypatch.setattr(app, "replit_auth", ReplitAuth())
+    app.replit_auth.repl_id, app.replit_auth.repl_owner, app.replit_auth.replit_user, app.replit_auth.replit_domains = env
+
+    assert app.get_replit_user_info() == {
+        'id': 'owner',
+        'name': 'chef',
+        'authenticated': True,
+        'repl_id': 'abc123',
+        'repl_owner': 'owner',
+        'replit_user': 'chef',
+    }
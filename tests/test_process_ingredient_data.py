@@ -0,0 +1,137 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+# Ensure the application module can be imported when tests run from any path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app import process_ingredient_data
+
+
+def make_inputs():
+    ingredient_info = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Unit Cost": [2.0, 3.0]})
+    input_stock = pd.DataFrame({"Ingredient": ["Sugar", "Flour"], "Received Qty": [10, 20]})
+    usage = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Used Qty": [12, 6]})
+    waste = pd.DataFrame({"Ingredient": ["Flour"], "Wasted Qty": [3]})
+    return ingredient_info, input_stock, usage, waste
+
+
+def test_costs_are_calculated(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(st, "warning", lambda msg: warnings.append(msg))
+
+    df = process_ingredient_data(*make_inputs())
+
+    assert warnings == []
+    assert df["Ingredient"].tolist() == ["Flour", "Sugar"]
+    assert df.sort_values("Ingredient", ascending=False)["Ingredient"].tolist() == ["Sugar", "Flour"]
+    assert df["Wasted"].tolist() == [3, 0]
+    assert df["Used Cost"].tolist() == pytest.approx([24.0, 18.0])
+    assert df["Waste Cost"].tolist() == pytest.approx([6.0, 0.0])
+    assert df["Shrinkage Cost"].tolist() == pytest.approx([10.0, 12.0])
+    assert df["Total Cost"].tolist() == pytest.approx([40.0, 30.0])
+
+
+def test_missing_ingredient_is_added_with_zero_cost(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(st, "warning", lambda msg: warnings.append(msg))
+
+    ingredient_info, input_stock, usage, waste = make_inputs()
+    usage = pd.concat([usage, pd.DataFrame({"Ingredient": ["Basil"], "Used Qty": [4]})], ignore_index=True)
+
+    df = process_ingredient_data(ingredient_info, input_stock, usage, waste)
+
+    assert len(warnings) == 1 and warnings[0].endswith(": Basil")
+    assert df["Ingredient"].tolist() == ["Basil", "Flour", "Sugar"]
+    assert df.sort_values("Ingredient")["Ingredient"].tolist() == ["Basil", "Flour", "Sugar"]
+    basil = df.iloc[0]
+    assert basil["Used"] == 4
+    assert basil["Unit Cost"] == 0
+    assert basil["Total Cost"] == 0
+
+
+def test_missing_column_raises():
+    ingredient_info, input_stock, usage, waste = make_inputs()
+
+    with pytest.raises(ValueError, match="Waste CSV is missing required columns: Wasted Qty"):
+        process_ingredient_data(ingredient_info, input_stock, usage, waste.rename(columns={"Wasted Qty": "Qty"}))
+
+
+def test_warning_repeats_on_cached_call(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(st, "warning", lambda msg: warnings.append(msg))
+
+    ingredient_info, input_stock, usage, waste = make_inputs()
+    stock = pd.concat([input_stock, pd.DataFrame({"Ingredient": ["Thyme"], "Received Qty": [1]})], ignore_index=True)
+
+    first = process_ingredient_data(ingredient_info, stock, usage, waste)
+    second = process_ingredient_data(ingredient_info, stock, usage, waste)
+
+    assert len(warnings) == 2 and warnings[0] == warnings[1]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_aligned_inputs_fill_missing_quantities():
+    ingredient_info = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Unit Cost": [2.0, 3.0]})
+    input_stock = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Received Qty": [20, 10]})
+    usage = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Used Qty": [12.0, float("nan")]})
+    waste = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Wasted Qty": [3, 1]})
+
+    df = process_ingredient_data(ingredient_info, input_stock, usage, waste)
+
+    assert df["Used"].tolist() == [12, 0]
+    assert df["Total Cost"].tolist() == pytest.approx([40.0, 30.0])
+    assert usage["Used Qty"].isna().tolist() == [False, True]
+
+
+@pytest.mark.parametrize("position, file_type", [
+    (0, "Ingredient Info CSV"), (1, "Stock CSV"), (2, "Usage CSV"), (3, "Waste CSV"),
+])
+def test_blank_ingredient_name_raises(position, file_type):
+    inputs = list(make_inputs())
+    frame = inputs[position]
+    inputs[position] = pd.concat(
+        [frame, pd.DataFrame({"Ingredient": [None], frame.columns[1]: [4]})], ignore_index=True
+    )
+
+    with pytest.raises(ValueError, match=f"{file_type} has blank ingredient names at rows: \\[{len(frame)}\\]"):
+        process_ingredient_data(*inputs)
+
+
+def test_ingredient_categories_match_row_data(monkeypatch):
+    monkeypatch.setattr(st, "warning", lambda msg: None)
+
+    ingredient_info, input_stock, usage, waste = make_inputs()
+    usage = pd.DataFrame({"Ingredient": ["Sugar", "Basil", "Flour"], "Used Qty": [6, 4, 12]})
+
+    df = process_ingredient_data(ingredient_info, input_stock, usage, waste)
+
+    assert isinstance(df["Ingredient"].dtype, pd.CategoricalDtype)
+    assert df["Ingredient"].cat.categories.tolist() == ["Basil", "Flour", "Sugar"]
+    assert not df["Ingredient"].isna().any()
+    assert dict(zip(df["Ingredient"], df["Used"])) == {"Basil": 4, "Flour": 12, "Sugar": 6}
+    assert dict(zip(df["Ingredient"], df["Unit Cost"])) == {"Basil": 0, "Flour": 2.0, "Sugar": 3.0}
+
+    # A blank name must not be relabelled as one of the categories
+    ingredient_info = pd.DataFrame({"Ingredient": ["Flour", None], "Unit Cost": [2.0, 5.0]})
+    with pytest.raises(ValueError, match="blank ingredient names"):
+        process_ingredient_data(ingredient_info, input_stock, usage, waste)
+
+
+def test_large_input_change_outside_hash_sample_is_reprocessed():
+    # Streamlit's default DataFrame hash only samples frames this large
+    n = 60_000
+    names = [f"Item {i:05d}" for i in range(n)]
+    ingredient_info = pd.DataFrame({"Ingredient": names, "Unit Cost": [1.0] * n})
+    input_stock = pd.DataFrame({"Ingredient": names, "Received Qty": [10.0] * n})
+    usage = pd.DataFrame({"Ingredient": names, "Used Qty": [5.0] * n})
+    waste = pd.DataFrame({"Ingredient": names, "Wasted Qty": [1.0] * n})
+
+    first = process_ingredient_data(ingredient_info, input_stock, usage, waste)
+    usage.loc[n - 1, "Used Qty"] = 7.0
+    second = process_ingredient_data(ingredient_info, input_stock, usage, waste)
+
+    assert first["Used"].iloc[-1] == 5
+    assert second["Used"].iloc[-1] == 7
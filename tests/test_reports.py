@@ -0,0 +1,60 @@
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# Ensure the application module can be imported when tests run from any path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import app
+
+
+def read_cells(report):
+    sheet = openpyxl.load_workbook(io.BytesIO(report)).active
+    return [[(cell.value, cell.number_format) for cell in row] for row in sheet.iter_rows()]
+
+
+def test_large_export_matches_regular_export(monkeypatch):
+    df = pd.DataFrame({
+        "Ingredient": ["Flour", "Sugar", " Salt & Pepper "],
+        "Unit Cost": [1.5, np.inf, 0.1],
+        "Used": [12.0, np.nan, 3.0],
+        "Used Cost": [18.0, 0.0, 0.3],
+        "Waste Cost": [0.0, 1.0, 2.0],
+        "Shrinkage Cost": [4.0, -1.0, 0.0],
+        "Total Cost": [22.0, 0.0, 2.3],
+    })
+
+    regular = read_cells(app.create_excel_report(df))
+    monkeypatch.setattr(app, "EXCEL_XML_MIN_ROWS", 0)
+    large = read_cells(app.create_excel_report(df))
+
+    # The generation timestamp is the only cell allowed to differ
+    assert large[:-1] == regular[:-1]
+    assert large[1][:3] == [("Flour", "General"), (1.5, "$#,##0.00"), (12.0, "#,##0.00")]
+    assert large[2][1][0] == "inf"
+    assert large[2][2][0] is None
+
+
+def test_parquet_export_round_trips():
+    df = pd.DataFrame({
+        "Ingredient": pd.Categorical(["Flour", "Sugar"]),
+        "Unit Cost": [1.5, 2.0],
+        "Total Cost": [22.0, np.nan],
+    })
+
+    restored = pd.read_parquet(io.BytesIO(app.create_parquet_report(df)))
+
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_export_cache_key_includes_report_timestamp():
+    first = pd.DataFrame({"Ingredient": ["Flour"], "Total Cost": [22.0]})
+    first.attrs["generated_at"] = "2024-01-01 09:00:00"
+    second = first.copy()
+    second.attrs["generated_at"] = "2024-01-01 09:05:00"
+
+    assert app._frame_digest(first) == app._frame_digest(first.copy())
+    assert app._frame_digest(first) != app._frame_digest(second)
@@ -55,3 +55,38 @@ def test_extra_column_warns(monkeypatch):
     assert validate_csv_structure(df, ["Ingredient", "Unit Cost"], "Ingredient Info CSV")
     assert errors == []
     assert len(warnings) == 1
+
+
+def test_negative_values_warn(monkeypatch):
+    errors = []
+    warnings = []
+    monkeypatch.setattr(st, "error", lambda msg: errors.append(msg))
+    monkeypatch.setattr(st, "warning", lambda msg: warnings.append(msg))
+
+    df = pd.DataFrame({"Ingredient": ["Flour", "Sugar"], "Received Qty": [5, -2]})
+
+    assert validate_csv_structure(df, ["Ingredient", "Received Qty"], "Input Stock CSV")
+    assert errors == []
+    assert warnings == ["Input Stock CSV has negative values in column 'Received Qty' at rows: [1]"]
+
+
+def test_duplicate_ingredients(monkeypatch):
+    captured = []
+    monkeypatch.setattr(st, "error", lambda msg: captured.append(msg))
+    monkeypatch.setattr(st, "warning", lambda msg: None)
+
+    df = pd.DataFrame({"Ingredient": ["Flour", "Sugar", "Flour"], "Unit Cost": [1.5, 2.0, 1.5]})
+
+    assert not validate_csv_structure(df, ["Ingredient", "Unit Cost"], "Ingredient Info CSV")
+    assert captured == ["Ingredient Info CSV contains duplicate ingredients: Flour"]
+
+
+def test_blank_ingredient_names(monkeypatch):
+    captured = []
+    monkeypatch.setattr(st, "error", lambda msg: captured.append(msg))
+    monkeypatch.setattr(st, "warning", lambda msg: None)
+
+    df = pd.DataFrame({"Ingredient": ["Flour", None, "  "], "Unit Cost": [1.5, 2.0, 3.0]})
+
+    assert not validate_csv_structure(df, ["Ingredient", "Unit Cost"], "Ingredient Info CSV")
+    assert captured == ["Ingredient Info CSV has blank ingredient names at rows: [1, 2]"]